@@ -10,4 +10,5 @@ __all__ = [
     "quick_sort",
     "inversions",
     "binary_search",
+    "binary_search_many",
 ]
@@ -4,9 +4,7 @@ create : @tarickali 24/01/07
 update : @tarickali 24/01/07
 """
 
-from copy import deepcopy
-
-from compkit.core import Number, INF
+from compkit.core import Number
 
 __all__ = ["inversions"]
 
@@ -27,37 +25,38 @@ def inversions(A: list[Number], inplace: bool = True) -> int:
     -------
     int
 
-    """
+    Implementation Note
+    -------------------
+    This function replaces each value of A by its rank among the distinct
+    values of A and scans A from right to left, using a Fenwick (binary
+    indexed) tree over the ranks to count the elements already seen that
+    are smaller than the current one.
 
-    def merge(l: int, m: int, r: int) -> int:
-        L = B[l:m] + [INF]
-        R = B[m:r] + [INF]
+    Complexity
+    ----------
+    Space : O(n)
+    Time : O(n•log(n))
 
-        i = j = 0
-        count = 0
-        for k in range(l, r):
-            if L[i] < R[j]:
-                B[k], i = L[i], i + 1
-            else:
-                B[k], j = R[j], j + 1
-                count += (m - l) - i
+    """
 
-        return count
+    ranks = {x: i for i, x in enumerate(sorted(set(A)), start=1)}
 
-    def recurse(l: int, r: int) -> int:
-        if r - l <= 1:
-            return 0
-        m = (r + l) // 2
-        left = recurse(l, m)
-        right = recurse(m, r)
-        middle = merge(l, m, r)
+    n = len(ranks)
+    tree = [0] * (n + 1)
 
-        return left + right + middle
+    count = 0
+    for r in map(ranks.__getitem__, reversed(A)):
+        # Prefix sum over ranks strictly smaller than r
+        i = r - 1
+        while i:
+            count += tree[i]
+            i &= i - 1
 
-    B = A
-    if not inplace:
-        B = deepcopy(A)
+        while r <= n:
+            tree[r] += 1
+            r += r & -r
 
-    count = recurse(0, len(B))
+    if inplace:
+        A.sort()
 
     return count
@@ -4,9 +4,11 @@ create : @tarickali 24/01/07
 update : @tarickali 24/01/07
 """
 
+from bisect import bisect_left
+
 from compkit.core import Number
 
-__all__ = ["binary_search"]
+__all__ = ["binary_search", "binary_search_many"]
 
 
 def binary_search(
@@ -28,8 +30,9 @@ def binary_search(
     -------
     (contains, index) : tuple[bool, int]
         If target is in A, contains = True, otherwise contains = False. If
-        contains = True, index is where target is in A, otherwise it is where
-        target would be inserted in A (shifting larger values right)
+        contains = True, index is the leftmost occurrence of target in A,
+        otherwise it is where target would be inserted in A (shifting larger
+        values right)
 
     Warnings
     --------
@@ -40,31 +43,57 @@ def binary_search(
 
     def recursion(l: int, r: int) -> tuple[bool, int]:
         if l >= r:
-            return False, l
+            return l < len(A) and A[l] == target, l
 
+        # On a match keep searching the left half for an earlier occurrence
         m = l + (r - l) // 2
-        if A[m] == target:
-            return True, m
-        elif A[m] < target:
+        if A[m] < target:
             return recursion(m + 1, r)
         else:
             return recursion(l, m)
 
     def iteration() -> tuple[bool, int]:
-        l = 0
-        r = len(A)
-
-        while l < r:
-            m = l + (r - l) // 2
-            if A[m] == target:
-                return True, m
-            elif A[m] < target:
-                l = m + 1
-            else:
-                r = m
-        return False, l
+        idx = bisect_left(A, target)
+        return idx < len(A) and A[idx] == target, idx
 
     if recursive:
         return recursion(0, len(A))
     else:
         return iteration()
+
+
+def binary_search_many(
+    A: list[Number], targets: list[Number]
+) -> list[tuple[bool, int]]:
+    """Search for each target of targets in a sorted array A.
+
+    Parameters
+    ----------
+    A : list[Number]
+        The array to search over
+    targets : list[Number]
+        The numbers to search for in A
+
+    Returns
+    -------
+    list[tuple[bool, int]]
+        The (contains, index) pair of binary_search(A, target) for each target
+        in targets, in the same order as targets
+
+    Warnings
+    --------
+    - This function assumes that the input array A is sorted. If A is not sorted,
+    then this functions behavior is not well-defined.
+
+    See Also
+    --------
+    binary_search : search for a single target
+
+    """
+
+    n = len(A)
+    results: list[tuple[bool, int]] = []
+    for target in targets:
+        idx = bisect_left(A, target)
+        results.append((idx < n and A[idx] == target, idx))
+    return results
@@ -4,10 +4,13 @@ create : @tarickali 23/12/26
 update : @tarickali 24/01/07
 """
 
-import random
-from copy import deepcopy
+import os
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, repeat
 
-from compkit.core import Number, INF
+from compkit.core import Number
 
 __all__ = [
     "bubble_sort",
@@ -17,8 +20,15 @@ __all__ = [
     "quick_sort",
 ]
 
+# Partitions of at most this size are insertion sorted by merge_sort and quick_sort
+_SMALL = 16
+# Inputs larger than this size are split across processes by merge_sort(parallel=True)
+_PARALLEL = 1 << 17
 
-def bubble_sort(A: list[Number], inplace: bool = True) -> list[Number]:
+
+def bubble_sort(
+    A: list[Number], inplace: bool = True, fast: bool = False
+) -> list[Number]:
     """Sort input array using the bubble sort algorithm.
 
     Parameters
@@ -26,16 +36,28 @@ def bubble_sort(A: list[Number], inplace: bool = True) -> list[Number]:
     A : list[Number]
     inplace : bool = True
         Determines if A is modified, resulting in A being sorted
+    fast : bool = False
+        Determines if the builtin list.sort is used instead of the reference
+        implementation
 
     Returns
     -------
     list[Number]
 
+    Notes
+    -----
+    - Setting fast = True sorts A with the builtin Timsort in O(n•log(n)) time
+    rather than with the reference implementation.
+
     """
 
     B = A
     if not inplace:
-        B = deepcopy(A)
+        B = A[:]
+
+    if fast:
+        _builtin_sort(B)
+        return B
 
     n = len(B)
     for _ in range(len(B)):
@@ -51,7 +73,9 @@ def bubble_sort(A: list[Number], inplace: bool = True) -> list[Number]:
     return B
 
 
-def insertion_sort(A: list[Number], inplace: bool = True) -> list[Number]:
+def insertion_sort(
+    A: list[Number], inplace: bool = True, fast: bool = False
+) -> list[Number]:
     """Sort input array using the insertion sort algorithm.
 
     Parameters
@@ -59,30 +83,96 @@ def insertion_sort(A: list[Number], inplace: bool = True) -> list[Number]:
     A : list[Number]
     inplace : bool = True
         Determines if A is modified, resulting in A being sorted
+    fast : bool = False
+        Determines if the builtin list.sort is used instead of the reference
+        implementation
 
     Returns
     -------
     list[Number]
 
+    Notes
+    -----
+    - Setting fast = True sorts A with the builtin Timsort in O(n•log(n)) time
+    rather than with the reference implementation.
+
+    - The insertion point of each item is found by binary search, and the
+    items after it are shifted by a single slice assignment. The sort still
+    moves O(n^2) items, but the moves are done by memmove rather than by the
+    interpreter.
+
     """
 
     B = A
     if not inplace:
-        B = deepcopy(A)
+        B = A[:]
 
-    n = len(B)
-    for i in range(1, n):
+    if fast:
+        _builtin_sort(B)
+        return B
+
+    _binary_insertion_sort(B, 0, len(B))
+
+    return B
+
+
+def _insertion_sort(B: list[Number], l: int, r: int) -> None:
+    """Sort B[l:r] in place using the insertion sort algorithm.
+
+    Parameters
+    ----------
+    B : list[Number]
+    l : int
+    r : int
+
+    """
+
+    for i in range(l + 1, r):
         x = B[i]
         j = i - 1
-        while j >= 0 and B[j] > x:
+        while j >= l and B[j] > x:
             B[j + 1] = B[j]
             j -= 1
         B[j + 1] = x
 
-    return B
 
+def _binary_insertion_sort(B: list[Number], l: int, r: int) -> None:
+    """Sort B[l:r] in place using the binary insertion sort algorithm.
+
+    Parameters
+    ----------
+    B : list[Number]
+    l : int
+    r : int
+
+    """
 
-def selection_sort(A: list[Number], inplace: bool = True) -> list[Number]:
+    for i in range(l + 1, r):
+        x = B[i]
+        if x < B[i - 1]:
+            j = bisect_right(B, x, l, i - 1)
+            B[j + 1 : i + 1] = B[j:i]
+            B[j] = x
+
+
+def _builtin_sort(B: list[Number]) -> None:
+    """Sort B in place using the builtin Timsort.
+
+    Parameters
+    ----------
+    B : list[Number]
+
+    """
+
+    if isinstance(B, list):
+        B.sort()
+    else:
+        B[:] = type(B)(B.typecode, sorted(B))
+
+
+def selection_sort(
+    A: list[Number], inplace: bool = True, fast: bool = False
+) -> list[Number]:
     """Sort input array using the selection sort algorithm.
 
     Parameters
@@ -90,16 +180,28 @@ def selection_sort(A: list[Number], inplace: bool = True) -> list[Number]:
     A : list[Number]
     inplace : bool = True
         Determines if A is modified, resulting in A being sorted
+    fast : bool = False
+        Determines if the builtin list.sort is used instead of the reference
+        implementation
 
     Returns
     -------
     list[Number]
 
+    Notes
+    -----
+    - Setting fast = True sorts A with the builtin Timsort in O(n•log(n)) time
+    rather than with the reference implementation.
+
     """
 
     B = A
     if not inplace:
-        B = deepcopy(A)
+        B = A[:]
+
+    if fast:
+        _builtin_sort(B)
+        return B
 
     n = len(B)
     for i in range(n):
@@ -112,7 +214,9 @@ def selection_sort(A: list[Number], inplace: bool = True) -> list[Number]:
     return B
 
 
-def merge_sort(A: list[Number], inplace: bool = True) -> list[Number]:
+def merge_sort(
+    A: list[Number], inplace: bool = True, fast: bool = False, parallel: bool = False
+) -> list[Number]:
     """Sort input array using the merge sort algorithm.
 
     Parameters
@@ -120,42 +224,193 @@ def merge_sort(A: list[Number], inplace: bool = True) -> list[Number]:
     A : list[Number]
     inplace : bool = True
         Determines if A is modified, resulting in A being sorted
+    fast : bool = False
+        Determines if the builtin list.sort is used instead of the reference
+        implementation
+    parallel : bool = False
+        Determines if large inputs are split into runs that are sorted in
+        separate processes before being merged
 
     Returns
     -------
     list[Number]
 
-    """
+    Notes
+    -----
+    - The builtin list.sort is Timsort, a stable merge sort hybrid implemented
+    in C. Setting fast = True gives the same result as the reference
+    implementation without paying the interpreter cost of each comparison.
 
-    def merge(l: int, m: int, r: int) -> None:
-        L = B[l:m] + [INF]
-        R = B[m:r] + [INF]
+    - Runs of at most 16 items are sorted with insertion sort rather than split
+    further, which is faster than merging on inputs this small.
 
-        i = j = 0
-        for k in range(l, r):
-            if L[i] < R[j]:
-                B[k], i = L[i], i + 1
-            else:
-                B[k], j = R[j], j + 1
+    - A may also be a typed array.array of numbers, which is sorted without
+    converting it to a list.
 
-    def recurse(l: int, r: int) -> None:
-        if r - l <= 1:
-            return
-        m = (r + l) // 2
-        recurse(l, m)
-        recurse(m, r)
-        merge(l, m, r)
+    - If the items of A are integers that span a range smaller than the size
+    of A, A is sorted by counting the occurrences of each value in O(n) time.
+
+    - If parallel = True, A has more than 2^17 items, and more than one CPU is
+    available, A is split into one run per CPU, the runs are sorted concurrently
+    by worker processes, and the sorted runs are merged pairwise in the calling
+    process.
+
+    """
 
     B = A
     if not inplace:
-        B = deepcopy(A)
+        B = A[:]
 
-    recurse(0, len(B))
+    if parallel and len(B) > _PARALLEL and (os.cpu_count() or 1) > 1:
+        _parallel_merge_sort(B, fast=fast)
+    elif fast:
+        _builtin_sort(B)
+    elif not _counting_sort(B):
+        _merge_sort(B, 0, len(B))
 
     return B
 
 
-def quick_sort(A: list[Number], inplace: bool = True) -> list[Number]:
+def _counting_sort(B: list[Number]) -> bool:
+    """Sort B in place by counting its items, if they are integers of a small range.
+
+    Parameters
+    ----------
+    B : list[Number]
+
+    Returns
+    -------
+    bool
+        True if B is sorted, and False if B is left untouched because it is
+        small, its items are not all integers, or their range is not smaller
+        than the size of B
+
+    """
+
+    n = len(B)
+    if n <= _SMALL:
+        return False
+    if isinstance(B, list):
+        if not all(type(x) is int for x in B):
+            return False
+    elif B.typecode not in "bBhHiIlLqQ":
+        return False
+
+    lo, hi = min(B), max(B)
+    if hi - lo >= n:
+        return False
+
+    counts = [0] * (hi - lo + 1)
+    for x in B:
+        counts[x - lo] += 1
+
+    items = chain.from_iterable(map(repeat, range(lo, hi + 1), counts))
+    if isinstance(B, list):
+        B[:] = items
+    else:
+        B[:] = type(B)(B.typecode, items)
+    return True
+
+
+def _merge_sort(B: list[Number], l: int, r: int) -> None:
+    """Sort B[l:r] in place using the merge sort algorithm.
+
+    Parameters
+    ----------
+    B : list[Number]
+    l : int
+    r : int
+
+    """
+
+    if r - l <= _SMALL:
+        _insertion_sort(B, l, r)
+        return
+    m = (r + l) // 2
+    _merge_sort(B, l, m)
+    _merge_sort(B, m, r)
+    _merge(B, l, m, r)
+
+
+def _parallel_merge_sort(B: list[Number], fast: bool = False) -> None:
+    """Sort B in place by sorting runs of B in worker processes and merging them.
+
+    Parameters
+    ----------
+    B : list[Number]
+    fast : bool = False
+        Determines if the runs are sorted with the builtin list.sort
+
+    """
+
+    n = len(B)
+    size = -(-n // (os.cpu_count() or 1))
+    bounds = list(range(0, n, size)) + [n]
+
+    with ProcessPoolExecutor() as executor:
+        runs = executor.map(
+            partial(merge_sort, fast=fast),
+            [B[l:r] for l, r in zip(bounds, bounds[1:])],
+        )
+        for l, r, run in zip(bounds, bounds[1:], runs):
+            B[l:r] = run
+
+    while len(bounds) > 2:
+        merged = [bounds[0]]
+        for i in range(2, len(bounds), 2):
+            _merge(B, bounds[i - 2], bounds[i - 1], bounds[i])
+            merged.append(bounds[i])
+        if len(bounds) % 2 == 0:
+            merged.append(bounds[-1])
+        bounds = merged
+
+
+def _merge(B: list[Number], l: int, m: int, r: int) -> None:
+    """Merge the sorted runs B[l:m] and B[m:r] into B[l:r].
+
+    Only the left run is copied out of B, the right run is merged from its
+    place in B since the write index never overtakes its read index. Items at
+    the front of the left run and at the back of the right run that are already
+    in their final position are found by binary search and left untouched.
+
+    Parameters
+    ----------
+    B : list[Number]
+    l : int
+    m : int
+    r : int
+
+    """
+
+    l = bisect_right(B, B[m], l, m)
+    if l == m:
+        return
+    r = bisect_left(B, B[m - 1], m, r)
+
+    L = B[l:m]
+    n = m - l
+
+    i, j, k = 0, m, l
+    x, y = L[0], B[m]
+    while True:
+        if x <= y:
+            B[k] = x
+            k, i = k + 1, i + 1
+            if i == n:
+                return
+            x = L[i]
+        else:
+            B[k] = y
+            k, j = k + 1, j + 1
+            if j == r:
+                B[k:r] = L[i:]
+                return
+            y = B[j]
+
+
+def quick_sort(
+    A: list[Number], inplace: bool = True, fast: bool = False
+) -> list[Number]:
     """Sort input array using the quick sort algorithm.
 
     Parameters
@@ -163,37 +418,160 @@ def quick_sort(A: list[Number], inplace: bool = True) -> list[Number]:
     A : list[Number]
     inplace : bool = True
         Determines if A is modified, resulting in A being sorted
+    fast : bool = False
+        Determines if the builtin list.sort is used instead of the reference
+        implementation
 
     Returns
     -------
     list[Number]
 
-    """
+    Notes
+    -----
+    - The pivot of each partition is the median of its first, middle, and last
+    items, and the partition is done with Hoare's two-pointer scheme.
 
-    def partition(l: int, r: int) -> int:
-        p = random.randrange(l, r)
-        key = B[p]
-        B[l], B[p] = B[p], B[l]
+    - Partitions of at most 16 items are sorted with insertion sort rather than
+    partitioned further, which is faster than recursing on inputs this small.
 
-        k = l
-        for i in range(l + 1, r):
-            if B[i] < key:
-                k += 1
-                B[i], B[k] = B[k], B[i]
-        B[l], B[k] = B[k], B[l]
-        return k
+    - Only the smaller side of each partition is sorted recursively, the larger
+    side is sorted by the same call, so the recursion depth is O(log(n)).
 
-    def recurse(l: int, r: int) -> None:
-        if r - l <= 1:
-            return
-        p = partition(l, r)
-        recurse(l, p)
-        recurse(p + 1, r)
+    - A range that is still unsorted after 4•log2(n) partitions is heap sorted
+    (introsort), so the running time is O(n•log(n)) even on inputs for which
+    the median of three pivots are poor.
+
+    - A may also be a typed array.array of numbers, which is sorted without
+    converting it to a list.
+
+    - If the items of A are integers that span a range smaller than the size
+    of A, A is sorted by counting the occurrences of each value in O(n) time.
+
+    - Setting fast = True sorts A with the builtin Timsort rather than with the
+    reference implementation.
+
+    """
 
     B = A
     if not inplace:
-        B = deepcopy(A)
+        B = A[:]
 
-    recurse(0, len(B))
+    if fast:
+        _builtin_sort(B)
+    elif not _counting_sort(B):
+        _quick_sort(B, 0, len(B), 4 * (len(B).bit_length() - 1))
 
     return B
+
+
+def _quick_sort(B: list[Number], l: int, r: int, depth: int) -> None:
+    """Sort B[l:r] in place using the quick sort algorithm.
+
+    Parameters
+    ----------
+    B : list[Number]
+    l : int
+    r : int
+    depth : int
+        The number of partitions left before B[l:r] is heap sorted instead
+
+    """
+
+    # Recurse into the smaller side and loop on the larger one
+    while r - l > _SMALL:
+        if depth == 0:
+            _heap_sort(B, l, r)
+            return
+        depth -= 1
+        p = _partition(B, l, r) + 1
+        if p - l < r - p:
+            _quick_sort(B, l, p, depth)
+            l = p
+        else:
+            _quick_sort(B, p, r, depth)
+            r = p
+    _insertion_sort(B, l, r)
+
+
+def _heap_sort(B: list[Number], l: int, r: int) -> None:
+    """Sort B[l:r] in place using the heap sort algorithm.
+
+    Parameters
+    ----------
+    B : list[Number]
+    l : int
+    r : int
+
+    """
+
+    n = r - l
+    for i in reversed(range(n // 2)):
+        _sift_down(B, l, i, n)
+    for end in range(n - 1, 0, -1):
+        B[l], B[l + end] = B[l + end], B[l]
+        _sift_down(B, l, 0, end)
+
+
+def _sift_down(B: list[Number], l: int, i: int, n: int) -> None:
+    """Restore the max-heap B[l:l + n] by moving the item at index i downwards.
+
+    Parameters
+    ----------
+    B : list[Number]
+    l : int
+    i : int
+    n : int
+
+    """
+
+    x = B[l + i]
+    c = 2 * i + 1
+    while c < n:
+        if c + 1 < n and B[l + c] < B[l + c + 1]:
+            c += 1
+        y = B[l + c]
+        if not x < y:
+            break
+        B[l + i] = y
+        i, c = c, 2 * c + 1
+    B[l + i] = x
+
+
+def _partition(B: list[Number], l: int, r: int) -> int:
+    """Partition B[l:r] around the median of its first, middle, and last items.
+
+    Parameters
+    ----------
+    B : list[Number]
+    l : int
+    r : int
+
+    Returns
+    -------
+    int
+        An index j such that every item of B[l:j + 1] is at most every item
+        of B[j + 1:r]
+
+    """
+
+    # Order B[l], B[m], B[r - 1] so that B[m] is their median
+    m = (l + r - 1) // 2
+    if B[m] < B[l]:
+        B[l], B[m] = B[m], B[l]
+    if B[r - 1] < B[l]:
+        B[l], B[r - 1] = B[r - 1], B[l]
+    if B[r - 1] < B[m]:
+        B[m], B[r - 1] = B[r - 1], B[m]
+    key = B[m]
+
+    i, j = l - 1, r
+    while True:
+        i += 1
+        while B[i] < key:
+            i += 1
+        j -= 1
+        while B[j] > key:
+            j -= 1
+        if i >= j:
+            return j
+        B[i], B[j] = B[j], B[i]
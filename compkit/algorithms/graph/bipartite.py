@@ -4,7 +4,7 @@ create : @tarickali 23/12/31
 update : @tarickali 23/12/31
 """
 
-from queue import Queue
+from collections import deque
 
 from compkit.core import ID
 from compkit.structures import Graph
@@ -45,20 +45,20 @@ def is_bipartite(G: Graph) -> bool:
     colors: dict[ID, int] = {}
 
     def coloring(s: ID) -> bool:
-        queue: Queue[ID] = Queue()
+        queue: deque[ID] = deque()
 
-        colors[s] = True
-        queue.put(s)
+        colors[s] = 0
+        queue.append(s)
 
-        while not queue.empty():
-            x = queue.get()
+        while queue:
+            x = queue.popleft()
             for y in G.adjacent(x):
                 if y in colors:
                     if colors[y] == colors[x]:
                         return False
                 else:
-                    colors[y] = not colors[x]
-                    queue.put(y)
+                    colors[y] = 1 - colors[x]
+                    queue.append(y)
 
         return True
 
@@ -18,6 +18,9 @@ __all__ = [
     "strongly_connected",
 ]
 
+# Shared default for ignore so membership tests never need a None check
+_EMPTY: frozenset = frozenset()
+
 
 def connected_components(
     G: Graph, ignore: set[ID] | set[Node] = None, as_nodes: bool = False
@@ -65,6 +68,8 @@ def connected_components(
 
     """
 
+    ignore = ignore if ignore is not None else _EMPTY
+
     T = G.to_undirected()
     return graph_search(T, traversal_method="bfs", ignore=ignore, as_nodes=as_nodes)
 
@@ -103,11 +108,8 @@ def connectivity(G: Graph, ignore: set[ID] | set[Node] = None) -> int:
 
     """
 
-    as_nodes = False
-    if ignore is not None and len(ignore) != 0:
-        i = ignore.pop()
-        as_nodes = isinstance(i, Node)
-        ignore.add(i)
+    ignore = ignore if ignore is not None else _EMPTY
+    as_nodes = isinstance(next(iter(ignore), None), Node)
 
     return len(connected_components(G, ignore=ignore, as_nodes=as_nodes))
 
@@ -179,8 +181,9 @@ def strongly_connected_components(
 
     Implementation Note
     -------------------
-    This function implements Kosaraju's two-pass algorithm to find the strongly
-    connected components of G.
+    This function implements an iterative version of Tarjan's algorithm, which
+    finds the strongly connected components of G in a single depth-first pass
+    over the edges of G.
 
     Complexity
     ----------
@@ -193,37 +196,55 @@ def strongly_connected_components(
 
     """
 
-    explored: set[ID] | set[Node] = set()
-    ordering: list[ID] | set[Node] = []
-    assigned: dict[ID, int] | dict[Node, int] = {}
-
-    def visit(x: ID | Node) -> None:
-        explored.add(x)
-        for y in D.coadjacent(x, as_nodes=as_nodes):
-            if y not in explored and y not in ignore:
-                visit(y)
-        ordering.append(x)
-
-    def assign(x: ID | Node, c: int) -> None:
-        assigned[x] = c
-        for y in D.adjacent(x, as_nodes=as_nodes):
-            if y not in assigned and y not in ignore:
-                assigned(y, c)
-
-    for x in D.get_nodes(as_nodes=as_nodes):
-        if x not in explored and x not in ignore:
+    ignore = ignore if ignore is not None else _EMPTY
+
+    nodes = D.get_nodes(as_nodes=as_nodes)
+    forward = {x: D.adjacent(x, as_nodes=as_nodes) for x in nodes}
+
+    index: dict[ID, int] | dict[Node, int] = {}
+    lowlink: dict[ID, int] | dict[Node, int] = {}
+    stack: list[ID] | list[Node] = []
+    stacked: set[ID] | set[Node] = set()
+    position: dict[ID, int] | dict[Node, int] = {}
+    components: list[set[ID]] | list[set[Node]] = []
+
+    def explore(x: ID | Node) -> None:
+        index[x] = lowlink[x] = len(index)
+        position[x] = len(stack)
+        stack.append(x)
+        stacked.add(x)
+
+    def visit(s: ID | Node) -> None:
+        explore(s)
+        path = [(s, iter(forward[s]))]
+        while path:
+            x, children = path[-1]
+            for y in children:
+                if y in ignore:
+                    continue
+                if y not in index:
+                    explore(y)
+                    path.append((y, iter(forward[y])))
+                    break
+                if y in stacked and index[y] < lowlink[x]:
+                    lowlink[x] = index[y]
+            else:
+                path.pop()
+                if path:
+                    p = path[-1][0]
+                    lowlink[p] = min(lowlink[p], lowlink[x])
+                if lowlink[x] == index[x]:
+                    # x roots a component made of everything above it on stack
+                    i = position[x]
+                    component = set(stack[i:])
+                    del stack[i:]
+                    stacked.difference_update(component)
+                    components.append(component)
+
+    for x in nodes:
+        if x not in index and x not in ignore:
             visit(x)
 
-    c = 0
-    for x in reversed(ordering):
-        if x not in assigned and x not in ignore:
-            assign(x, c)
-            c += 1
-
-    components: list[set[ID]] | list[set[Node]] = [set() for _ in range(c)]
-    for x, c in assigned.items():
-        components[c].add(x)
-
     return components
 
 
@@ -255,11 +276,8 @@ def strong_connectivity(D: DiGraph, ignore: set[ID] | set[Node] = None) -> int:
 
     """
 
-    as_nodes = False
-    if ignore is not None and len(ignore) != 0:
-        i = ignore.pop()
-        as_nodes = isinstance(i, Node)
-        ignore.add(i)
+    ignore = ignore if ignore is not None else _EMPTY
+    as_nodes = isinstance(next(iter(ignore), None), Node)
 
     return len(strongly_connected_components(D, ignore=ignore, as_nodes=as_nodes))
 
@@ -36,28 +36,28 @@ def is_cyclic(D: DiGraph) -> bool:
 
     """
 
-    explored: set[ID] = set()
-    visited: set[ID] = set()
-
-    def visit(x: ID) -> None:
-        if x in visited:
-            raise
-        if x in explored:
-            return
-
-        visited.add(x)
-        for y in D.adjacent(x):
-            visit(y)
-
-        visited.remove(x)
-        explored.add(x)
-
-    for x in D.get_nodes():
-        if x not in explored:
-            try:
-                visit(x)
-            except:
-                return True
+    # x -> True while x is on the current path, False once x is explored
+    active: dict[ID, bool] = {}
+
+    for s in D.get_nodes():
+        if s in active:
+            continue
+
+        active[s] = True
+        stack = [(s, iter(D.adjacent(s)))]
+        while stack:
+            x, children = stack[-1]
+            for y in children:
+                state = active.get(y)
+                if state is None:
+                    active[y] = True
+                    stack.append((y, iter(D.adjacent(y))))
+                    break
+                if state:
+                    return True
+            else:
+                stack.pop()
+                active[x] = False
 
     return False
 
@@ -122,29 +122,29 @@ def topological_sort(
 
     """
 
-    explored: set[ID] | set[Node] = set()
-    visited: set[ID] | set[Node] = set()
+    # x -> True while x is on the current path, False once x is explored
+    active: dict[ID, bool] | dict[Node, bool] = {}
     ordering: list[ID] | list[Node] = []
 
-    def visit(x: ID | Node) -> None:
-        if x in visited:
-            raise
-        if x in explored:
-            return
-
-        visited.add(x)
-        for y in D.adjacent(x, as_nodes=as_nodes):
-            visit(y)
-
-        visited.remove(x)
-        explored.add(x)
-        ordering.append(x)
-
-    for x in D.get_nodes(as_nodes=as_nodes):
-        if x not in explored:
-            try:
-                visit(x)
-            except:
-                return None
+    for s in D.get_nodes(as_nodes=as_nodes):
+        if s in active:
+            continue
+
+        active[s] = True
+        stack = [(s, iter(D.adjacent(s, as_nodes=as_nodes)))]
+        while stack:
+            x, children = stack[-1]
+            for y in children:
+                state = active.get(y)
+                if state is None:
+                    active[y] = True
+                    stack.append((y, iter(D.adjacent(y, as_nodes=as_nodes))))
+                    break
+                if state:
+                    return None
+            else:
+                stack.pop()
+                active[x] = False
+                ordering.append(x)
 
     return ordering[::-1]
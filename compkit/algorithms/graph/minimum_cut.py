@@ -5,9 +5,10 @@ update : @tarickali 24/01/03
 """
 
 import math
+import random
 
-from compkit.core import ID, Node
-from compkit.structures import Graph
+from compkit.core import ID
+from compkit.structures import Graph, UnionFind
 
 from .connectivity import connected
 
@@ -45,25 +46,48 @@ def karger(G: Graph, T: int = None) -> tuple[tuple[set[ID], set[ID]], int]:
     of iterations T of the subrountine increases. By default, T = nC2 * ln(n),
     which gives a probability of 1/n that the output is not a minimum cut.
 
+    Implementation Note
+    -------------------
+    Each iteration of the `mincut` subroutine contracts the edges of G in a
+    uniformly random order with a union-find over the nodes of G, rather than
+    copying and contracting G itself, until two multinodes remain.
+
     Complexity
     ----------
     Space : O(n + m)
-    Time : O(T m) = O(n^2•m•log(n)) (by default)
+    Time : O(T m•α(n)) = O(n^2•m•log(n)•α(n)) (by default)
 
     """
 
-    mincut_errors()
+    mincut_errors(G)
 
-    key = "multinode"
+    nodes = G.get_nodes(as_nodes=True)
+    edges = [e.nodes() for e in G.get_edges(as_links=True)]
 
     def mincut() -> tuple[tuple[set[ID], set[ID]], int]:
-        H = G.copy()
-        while H.order > 2:
-            e = H.choose_edge()
-            H.contract_edge(e, key=key)
-
-        x, y = H.nodes
-        return (x.data[key], y.data[key]), H.size
+        U = UnionFind(nodes)
+
+        # Contracting the edges of a uniformly random ordering, skipping those
+        # inside a multinode, is equivalent to contracting random edges of G.
+        components = G.order
+        for xid, yid in random.sample(edges, len(edges)):
+            if components == 2:
+                break
+            if U.find(xid) != U.find(yid):
+                U.union(xid, yid)
+                components -= 1
+
+        size = sum(1 for xid, yid in edges if U.find(xid) != U.find(yid))
+
+        root = U.find(nodes[0])
+        A, B = set(), set()
+        for x in nodes:
+            if U.find(x) == root:
+                A.add(x.uid)
+            else:
+                B.add(x.uid)
+
+        return (A, B), size
 
     if T == None:
         T = math.ceil(math.comb(G.order, 2) * math.log(G.order))
@@ -4,16 +4,21 @@ create : @tarickali 23/12/31
 update : @tarickali 24/01/06
 """
 
-from queue import Queue
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from heapq import heappush, heappop
 
 from compkit.core import ID, Node, Number
-from compkit.core.constants import Number, INF, DISTANCE, SPECIAL
-from compkit.structures import Heap, Graph, DiGraph
-from compkit.utils.types import create_links
+from compkit.core.constants import INF
+from compkit.structures import Graph, DiGraph
 
 __all__ = [
     "graph_layers",
     "dijkstra",
+    "delta_stepping",
 ]
 
 
@@ -52,18 +57,19 @@ def graph_layers(G: Graph, s: ID | Node) -> dict[ID, int]:
     if s not in G:
         raise ValueError(f"Node={s} is not in G. Cannot compute graph layers.")
 
-    layers: dict[ID, int] = {x: INF for x in G.get_nodes()}
-    queue: Queue[ID] = Queue()
+    adjacent = G.adjacent
+    layers: dict[ID, int] = dict.fromkeys(G.get_nodes(), INF)
+    queue: deque[ID] = deque([s])
 
     layers[s] = 0
-    queue.put(s)
 
-    while not queue.empty():
-        x = queue.get()
-        for y in G.adjacent(x):
+    while queue:
+        x = queue.popleft()
+        layer = layers[x] + 1
+        for y in adjacent(x):
             if layers[y] == INF:
-                layers[y] = layers[x] + 1
-                queue.put(y)
+                layers[y] = layer
+                queue.append(y)
 
     return layers
 
@@ -115,9 +121,13 @@ def dijkstra(
     - This algorithm only computes the correct shortest pths in G if all
     edges in G have non-negative labels.
 
+    - The frontier never has its keys decreased. Every improved distance pushes
+    a new entry and entries of explored nodes are discarded when popped, so the
+    frontier may hold up to O(m) stale entries, each popped in O(log(m)) time.
+
     Complexity
     ----------
-    Space : O(n)
+    Space : O(n + m)
     Time : O((n + m)•log(n))
 
     """
@@ -127,45 +137,212 @@ def dijkstra(
 
     s = s.uid if isinstance(s, Node) else s
 
-    frontier: Heap = Heap(DISTANCE)
-    explored: set[ID] | set[Node] = set()
+    # Parallel edges are collapsed up front so each relaxation is a dict lookup
+    weights = _min_weights(G, label)
 
-    dist: dict[ID, Number] = {}
-    if include_prev:
-        prev: dict[ID, ID] = {}
+    dist, prev = _dijkstra(weights, s)
 
-    for x in G.get_nodes():
-        dist[x] = INF
-        if include_prev:
-            prev[x] = None
+    if not include_prev:
+        return dist
+    else:
+        return dist, prev
+
+
+def _min_weights(G: Graph, label: str) -> dict[ID, dict[ID, Number]]:
+    """Compute the minimum label over the edges between each pair of adjacent nodes.
+
+    Parameters
+    ----------
+    G : Graph
+    label : str
+
+    Returns
+    -------
+    dict[ID, dict[ID, Number]]
+        A dictionary mapping each node x in G to a dictionary mapping each node
+        y in G.adjacent(x) to the minimum label of the edges from x to y
+
+    Raises
+    ------
+    KeyError
+        If there is an edge e in G that does not have label in e.data
+
+    """
+
+    directed = G.is_directed
+    weights: dict[ID, dict[ID, Number]] = {x: {} for x in G.get_nodes()}
+    for e in G.get_edges(as_links=True):
+        w, x, y = e[label], e.xid, e.yid
+        if w < weights[x].get(y, INF):
+            weights[x][y] = w
+        if not directed and w < weights[y].get(x, INF):
+            weights[y][x] = w
+    return weights
+
+
+def _dijkstra(
+    weights: dict[ID, dict[ID, Number]], s: ID
+) -> tuple[dict[ID, Number], dict[ID, ID]]:
+    """Compute the shortest paths from s over the labels in weights.
+
+    Parameters
+    ----------
+    weights : dict[ID, dict[ID, Number]]
+        A dictionary mapping each node x to a dictionary mapping each node y
+        adjacent to x to the label of the edge from x to y, see _min_weights
+    s : ID
+
+    Returns
+    -------
+    dist : dict[ID, Number]
+    prev : dict[ID, ID]
+
+    """
+
+    # Entries are (distance, counter, uid), the counter breaks distance ties so
+    # that uids are never compared. Instead of modifying the distance of a node
+    # in the frontier, a new entry is pushed and stale entries are skipped.
+    counter = itertools.count()
+    frontier: list[tuple[Number, int, ID]] = [(0, next(counter), s)]
+    explored: set[ID] = set()
+
+    dist: dict[ID, Number] = dict.fromkeys(weights, INF)
+    prev: dict[ID, ID] = dict.fromkeys(weights)
 
     dist[s] = 0
-    if include_prev:
-        prev[s] = None
-    frontier.insert(Node(s, {DISTANCE: 0}))
 
-    while not frontier.empty():
-        x = frontier.extract()
+    while frontier:
+        d, _, x = heappop(frontier)
+        if x in explored:
+            continue
         explored.add(x)
-        dist[x.uid] = x[DISTANCE]
 
-        for y in G.adjacent(x):
+        for y, w in weights[x].items():
             if y in explored:
                 continue
 
-            best = min(e[label] for e in G.get_edges_between(x, y))
-            temp = dist[x] + best
+            temp = d + w
 
-            if y in frontier:
-                if temp < frontier[y][DISTANCE]:
-                    frontier.modify(y, {DISTANCE: temp})
-                    if include_prev:
-                        prev[y] = x
-            else:
+            if temp < dist[y]:
                 dist[y] = temp
-                if include_prev:
-                    prev[y] = x
-                frontier.insert(Node(y, {DISTANCE: temp}))
+                prev[y] = x
+                heappush(frontier, (temp, next(counter), y))
+
+    return dist, prev
+
+
+def delta_stepping(
+    G: Graph,
+    s: ID | Node,
+    label: str,
+    delta: Number = None,
+    include_prev: bool = False,
+) -> dict[ID, Number] | tuple[dict[ID, Number], dict[ID, ID]]:
+    """Compute the shortest path from s to every reachable node in G.
+
+    Parameters
+    ----------
+    G : Graph
+        The graph to compute shortest paths on from s
+    s : ID | Node
+        The start node for computing shortest paths
+    label : str
+        The edge label to be used to compute shortest paths over
+    delta : Number = None
+        The width of each bucket of tentative distances, if None then it is
+        set to the maximum label divided by the average degree of G
+    include_prev : bool = False
+        Determines if the function will return a dictionary mapping
+        nodes to previous nodes in their shortest path from s
+
+    Returns
+    -------
+    dist : dict[ID, Number]
+        A dictionary mapping each node x in G to its shortest path value
+        from s
+    prev : dict[ID, ID] {this is only returned if include_prev = True}
+        A dictionary mapping each node x in G to its previous node y in x's
+        shortest path from s
+
+    Raises
+    ------
+    ValueError
+        If s is not in G or if delta is not positive
+    KeyError
+        If there is an edge e in G that does not have label in e.data
+
+    Warnings
+    --------
+    - If G has an edge e such that the label on e is negative then this method
+    is not guaranteed to return the correct shortest paths.
+
+    Notes
+    -----
+    - Nodes are kept in buckets of width delta by tentative distance. The
+    lowest non-empty bucket is emptied by repeatedly relaxing the light edges
+    (label <= delta) of its nodes, after which the heavy edges of every node
+    removed from it are relaxed once. All relaxations of a phase are computed
+    from the same distances, so each phase may be distributed across workers.
+
+    - A small delta makes this function behave like dijkstra, and a large
+    delta makes it behave like bellman_ford.
+
+    Complexity
+    ----------
+    Space : O(n + m)
+    Time : O(n•m)
+
+    See Also
+    --------
+    dijkstra : single-source shortest paths with a priority queue
+
+    """
+
+    if s not in G:
+        raise ValueError(f"Node={s} is not in G. Cannot compute shortest path.")
+
+    s = s.uid if isinstance(s, Node) else s
+
+    weights = _min_weights(G, label)
+
+    if delta is None:
+        degree = sum(map(len, weights.values())) / len(weights)
+        largest = max((w for ws in weights.values() for w in ws.values()), default=0)
+        delta = largest / degree if largest > 0 else 1
+    if delta <= 0:
+        raise ValueError(f"delta={delta} must be positive.")
+
+    light: dict[ID, list[tuple[ID, Number]]] = {}
+    heavy: dict[ID, list[tuple[ID, Number]]] = {}
+    for x, ws in weights.items():
+        light[x] = [(y, w) for y, w in ws.items() if w <= delta]
+        heavy[x] = [(y, w) for y, w in ws.items() if w > delta]
+
+    nodes = G.get_nodes()
+    dist: dict[ID, Number] = dict.fromkeys(nodes, INF)
+    prev: dict[ID, ID] = dict.fromkeys(nodes)
+    buckets: dict[int, set[ID]] = {}
+
+    def relax(requests: list[tuple[ID, Number, ID]]) -> None:
+        for y, d, x in requests:
+            if d < dist[y]:
+                if dist[y] != INF:
+                    buckets.get(int(dist[y] // delta), set()).discard(y)
+                buckets.setdefault(int(d // delta), set()).add(y)
+                dist[y] = d
+                prev[y] = x
+
+    relax([(s, 0, None)])
+
+    while buckets:
+        i = min(buckets)
+        removed: set[ID] = set()
+        while buckets.get(i):
+            bucket = buckets.pop(i)
+            removed |= bucket
+            relax([(y, dist[x] + w, x) for x in bucket for y, w in light[x]])
+        buckets.pop(i, None)
+        relax([(y, dist[x] + w, x) for x in removed for y, w in heavy[x]])
 
     if not include_prev:
         return dist
@@ -220,9 +397,13 @@ def bellman_ford(
     edge labels are negative numbers. However, this algorithm cannot compute
     the correct shortest path if D has neagtive cycles.
 
+    - Instead of relaxing every edge of D in each round, only the out-edges of
+    nodes whose distance improved are relaxed, using a FIFO queue of such nodes.
+    The worst case is unchanged but far fewer edges are relaxed in practice.
+
     Complexity
     ----------
-    Space : O(n)
+    Space : O(n + m)
     Time : O(m•n)
 
     """
@@ -232,39 +413,83 @@ def bellman_ford(
 
     s = s.uid if isinstance(s, Node) else s
 
-    dist: dict[ID, Number] = {}
-    if include_prev:
-        prev: dict[ID, ID] = {}
+    # Relax over dense integer indices so each relaxation is a list access
+    index = D.index()
+    nodes = list(index)
+    n = len(nodes)
 
-    for x in D.get_nodes():
-        dist[x] = INF
-        if include_prev:
-            prev[x] = None
+    adjacent: list[list[tuple[int, Number]]] = [[] for _ in range(n)]
+    for e in D.get_edges(as_links=True):
+        adjacent[index[e.xid]].append((index[e.yid], e[label]))
 
-    dist[s] = 0
-    if include_prev:
-        prev[s] = None
-    changed: bool = False
-
-    for i in range(D.order):
-        changed = False
-        for e in D.get_edges(as_links=True):
-            if dist.get(e.xid, INF) + e[label] < dist.get(e.yid, INF):
-                dist[e.yid] = dist[e.xid] + e[label]
-                if include_prev:
-                    prev[e.yid] = e.xid
-                changed = True
-        if changed == False:
-            break
-
-    # Check if D has a negative cycle
-    if changed == True and i == D.order - 1:
+    result = _bellman_ford(adjacent, [index[s]])
+    if result is None:
         return None
+    dist, prev = result
 
     if not include_prev:
-        return dist
+        return dict(zip(nodes, dist))
     else:
-        return dist, prev
+        return dict(zip(nodes, dist)), {
+            x: None if p is None else nodes[p] for x, p in zip(nodes, prev)
+        }
+
+
+def _bellman_ford(
+    adjacent: list[list[tuple[int, Number]]], sources: list[int]
+) -> tuple[list[Number], list[int]] | None:
+    """Compute the shortest paths from sources over integer indexed adjacency lists.
+
+    Parameters
+    ----------
+    adjacent : list[list[tuple[int, Number]]]
+        A list mapping each node x to a list of pairs (y, w) for each edge
+        from x to y with label w
+    sources : list[int]
+        The nodes that start at distance 0
+
+    Returns
+    -------
+    dist : list[Number]
+    prev : list[int]
+    None
+        If a negative cycle is reachable from sources
+
+    """
+
+    n = len(adjacent)
+    dist: list[Number] = [INF] * n
+    prev: list[int] = [None] * n
+    # Number of edges on the current shortest path to each node
+    length: list[int] = [0] * n
+
+    queued: list[bool] = [False] * n
+    queue: deque[int] = deque()
+
+    for i in sources:
+        dist[i] = 0
+        queued[i] = True
+        queue.append(i)
+
+    while queue:
+        x = queue.popleft()
+        queued[x] = False
+        dx = dist[x]
+        for y, w in adjacent[x]:
+            temp = dx + w
+            if temp < dist[y]:
+                dist[y] = temp
+                prev[y] = x
+                length[y] = length[x] + 1
+                # A shortest path with n edges must repeat a node, so there is
+                # a negative cycle
+                if length[y] >= n:
+                    return None
+                if not queued[y]:
+                    queued[y] = True
+                    queue.append(y)
+
+    return dist, prev
 
 
 def floyd_warshall(
@@ -314,6 +539,10 @@ def floyd_warshall(
     edge labels are negative numbers. However, this algorithm cannot compute
     the correct shortest paths if D has negative cycles.
 
+    - For each intermediate node z, only the nodes reachable from z and the
+    nodes that reach z are relaxed, so sparse digraphs take far fewer than n^3
+    steps in practice.
+
     Complexity
     ----------
     Space : O(n^2)
@@ -321,48 +550,56 @@ def floyd_warshall(
 
     """
 
-    dist: dict[ID, dict[ID, Number]] = {}
-    if include_succ:
-        succ: dict[ID, dict[ID, ID]] = {}
-
-    nodes = D.get_nodes()
-    for x in nodes:
-        dist[x], succ[x] = {}, {}
-        for y in nodes:
-            dist[x][y] = INF
-            if include_succ:
-                succ[x][y] = None
-        dist[x][x] = 0
-        if include_succ:
-            succ[x][x] = x
+    # Work on an n x n matrix over dense integer indices
+    index = D.index()
+    nodes = list(index)
+    n = len(nodes)
+
+    dist: list[list[Number]] = [[INF] * n for _ in range(n)]
+    succ: list[list[ID]] = [[None] * n for _ in range(n)]
+    for i, x in enumerate(nodes):
+        dist[i][i] = 0
+        succ[i][i] = x
 
     for e in D.get_edges(as_links=True):
         # Skip self-loops
         if e.xid != e.yid:
-            dist[e.xid][e.yid] = e[label]
-            if include_succ:
-                succ[e.xid][e.yid] = e.yid
-
-    for z in nodes:
-        for x in nodes:
-            for y in D.nodes:
-                if dist[x][y] > dist[x][z] + dist[z][y]:
-                    dist[x][y] = dist[x][z] + dist[z][y]
-                    if include_succ:
-                        succ[x][y] = succ[x][z]
-
-    for x in nodes:
-        if dist[x][x] < 0:
+            i, j = index[e.xid], index[e.yid]
+            if e[label] < dist[i][j]:
+                dist[i][j] = e[label]
+                succ[i][j] = e.yid
+
+    for z in range(n):
+        # Only the finite entries of row z can shorten a path through z
+        row = [(y, w) for y, w in enumerate(dist[z]) if w != INF and y != z]
+        if not row:
+            continue
+        for x in range(n):
+            dx = dist[x]
+            dxz = dx[z]
+            if dxz == INF or x == z:
+                continue
+            sx = succ[x]
+            sxz = sx[z]
+            for y, w in row:
+                temp = dxz + w
+                if temp < dx[y]:
+                    dx[y] = temp
+                    sx[y] = sxz
+
+    for i in range(n):
+        if dist[i][i] < 0:
             return None
 
+    dist = {x: dict(zip(nodes, row)) for x, row in zip(nodes, dist)}
     if not include_succ:
         return dist
     else:
-        return dist, succ
+        return dist, {x: dict(zip(nodes, row)) for x, row in zip(nodes, succ)}
 
 
 def johnson(
-    D: DiGraph, label: str, include_prev: bool = False
+    D: DiGraph, label: str, include_prev: bool = False, parallel: bool = False
 ) -> (
     dict[ID, dict[ID, Number]]
     | tuple[dict[ID, dict[ID, Number]], dict[ID, dict[ID, ID]]]
@@ -379,6 +616,9 @@ def johnson(
     include_prev : bool = False
         Determines if the function will return a dictionary mapping
         nodes to previous nodes in their shortest paths
+    parallel : bool = False
+        Determines if the searches from each node are run in separate
+        processes
 
     Returns
     -------
@@ -402,14 +642,16 @@ def johnson(
     unexpected behavior. However, if e[label] has well-defined mathematical
     operations, then this function should behave as expected.
 
-    - D must not contain a node with uid SPECIAL = "special"
-
     Notes
     -----
     - This algorithm can compute the correct shortest paths in D even if the
     edge labels are negative numbers. However, this algorithm cannot compute
     the correct shortest paths if D has negative cycles.
 
+    - The labels are reweighted once with the potentials found by bellman_ford
+    and shared by the n searches. If parallel = True and more than one CPU is
+    available, the searches are split across worker processes.
+
     Complexity
     ----------
     Space : O(m•n)
@@ -417,35 +659,40 @@ def johnson(
 
     """
 
-    Dw = D.copy()
-
-    temp = Node(SPECIAL)
-    Dw.add_nodes(temp)
-    Dw.add_edges(
-        create_links(
-            {(SPECIAL, yid): (temp.uid, yid, {label: 0}) for yid in Dw.get_nodes()}
-        )
-    )
+    index = D.index()
+    nodes = list(index)
+    weights = _min_weights(D, label)
 
-    costs = bellman_ford(Dw, temp, label)
-
-    if costs == None:
+    # The potential of each node is its distance from a virtual node that has
+    # an edge with label 0 to every node of D
+    adjacent = [[(index[y], w) for y, w in weights[x].items()] for x in nodes]
+    result = _bellman_ford(adjacent, range(len(nodes)))
+    if result is None:
         return None
-
-    for e in Dw.get_edges(as_links=True):
-        Dw[e.xid, e.yid][label] = Dw[e.xid, e.yid][label] + costs[e.xid] - costs[e.yid]
-
-    Dw.remove_node(temp)
+    h = dict(zip(nodes, result[0]))
+
+    # Reweighting once makes every label non-negative for all n searches
+    reweighted = {
+        x: {y: w + h[x] - h[y] for y, w in ws.items()} for x, ws in weights.items()
+    }
+
+    search = partial(_dijkstra, reweighted)
+    workers = os.cpu_count() or 1
+    if parallel and workers > 1:
+        with ProcessPoolExecutor() as executor:
+            chunksize = max(1, len(nodes) // (4 * workers))
+            results = list(executor.map(search, nodes, chunksize=chunksize))
+    else:
+        results = map(search, nodes)
 
     dist: dict[ID, dict[ID, Number]] = {}
     if include_prev:
         prev: dict[ID, dict[ID, ID]] = {}
 
-    for x in D.get_nodes():
+    for x, (dx, px) in zip(nodes, results):
+        dist[x] = {y: d if d == INF else d - h[x] + h[y] for y, d in dx.items()}
         if include_prev:
-            dist[x], prev[x] = dijkstra(Dw, x, label, include_prev=include_prev)
-        else:
-            dist[x] = dijkstra(Dw, x, label, include_prev=include_prev)
+            prev[x] = px
 
     if not include_prev:
         return dist
@@ -5,7 +5,7 @@ update : @tarickali 23/12/31
 """
 
 from typing import Literal
-from queue import Queue
+from collections import deque
 
 from compkit.core import ID, Node
 from compkit.structures import Graph
@@ -16,6 +16,9 @@ __all__ = [
     "graph_search",
 ]
 
+# Shared default for ignore so membership tests never need a None check
+_EMPTY: frozenset = frozenset()
+
 
 def breadth_first_search(
     G: Graph, s: ID | Node, ignore: set[ID] | set[Node] = None, as_nodes: bool = False
@@ -74,21 +77,18 @@ def breadth_first_search(
             f"{s} is not in G. Cannot traverse G from a node not in the graph."
         )
 
-    if ignore is None:
-        ignore = set()
-
-    explored: set[ID] | set[Node] = set()
-    queue: Queue[ID] | Queue[Node] = Queue()
+    ignore = ignore if ignore is not None else _EMPTY
 
-    explored.add(s)
-    queue.put(s)
+    adjacent = G.adjacent
+    explored: set[ID] | set[Node] = {s}
+    queue: deque[ID] | deque[Node] = deque([s])
 
-    while not queue.empty():
-        x = queue.get()
-        for y in G.adjacent(x, as_nodes=as_nodes):
+    while queue:
+        x = queue.popleft()
+        for y in adjacent(x, as_nodes):
             if y not in explored and y not in ignore:
                 explored.add(y)
-                queue.put(y)
+                queue.append(y)
 
     return explored
 
@@ -140,6 +140,12 @@ def depth_first_search(
     type(s) = ID then ensure type(ignore) = set[ID] or if type(s) = Node then
     ensure type(ignore) = set[Node].
 
+    Notes
+    -----
+    - The recursive traversal uses one Python stack frame per node on the
+    current path, so it is limited by the interpreter's recursion limit on
+    deep graphs. The default iterative traversal has no such limit.
+
     Complexity
     ----------
     Space : O(n)
@@ -157,8 +163,7 @@ def depth_first_search(
             f"{s} is not in G. Cannot traverse G from a node not in the graph."
         )
 
-    if ignore is None:
-        ignore = set()
+    ignore = ignore if ignore is not None else _EMPTY
 
     explored: set[ID] | set[Node] = set()
 
@@ -171,14 +176,12 @@ def depth_first_search(
                 recursion(y)
 
     def iteration() -> None:
-        stack: list[ID] | list[Node] = []
+        adjacent = G.adjacent
+        stack: list[ID] | list[Node] = [s]
 
-        explored.add(s)
-        stack.append(s)
-
-        while len(stack) != 0:
+        while stack:
             x = stack.pop()
-            for y in G.adjacent(x, as_nodes=as_nodes):
+            for y in adjacent(x, as_nodes):
                 if y not in explored and y not in ignore:
                     explored.add(y)
                     stack.append(y)
@@ -249,6 +252,8 @@ def graph_search(
 
     """
 
+    ignore = ignore if ignore is not None else _EMPTY
+
     explored: set[ID] | set[Node] = set()
     components: list[set[ID]] | list[set[Node]] = []
 
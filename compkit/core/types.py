@@ -15,7 +15,7 @@ ID = int | str | tuple | Hashable
 Number = int | float | complex
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Node:
     """A dictionary-like container with a unique ID used to store data.
 
@@ -56,7 +56,7 @@ class Node:
         self.data[key] = value
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Link:
     """A dictionary-like container with an ID used to store data between two Nodes.
 
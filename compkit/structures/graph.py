@@ -7,10 +7,139 @@ update : @tarickali 24/01/06
 from __future__ import annotations
 import copy
 import random
-from collections import defaultdict
+from array import array
+from collections import deque
+from functools import partial
+from itertools import chain
+from typing import Literal
 
-from compkit.core import ID, Node, Link
-from compkit.utils.types import create_links
+from compkit.core import ID, Node, Link, Number
+from compkit.utils.types import create_nodes, create_links
+
+Cell = ID | set  # the edge ID between two nodes, or a set of parallel edge IDs
+
+# Public methods unwrap a Node or Link argument with x.__class__ is Node, which
+# skips the isinstance machinery on the common path where x is already an ID.
+
+
+def _members(cell: Cell) -> set[ID] | tuple[ID]:
+    """Get the edge IDs stored in an adjacency cell.
+
+    Parameters
+    ----------
+    cell : Cell
+
+    Returns
+    -------
+    set[ID] | tuple[ID]
+
+    """
+
+    return cell if type(cell) is set else (cell,)
+
+
+def _count(cell: Cell) -> int:
+    """Get the number of edge IDs stored in an adjacency cell.
+
+    Parameters
+    ----------
+    cell : Cell
+
+    Returns
+    -------
+    int
+
+    """
+
+    return len(cell) if type(cell) is set else 1
+
+
+def _insert(row: dict[ID, Cell], yid: ID, eid: ID) -> int:
+    """Insert edge ID eid into the cell of yid in the adjacency row.
+
+    Parameters
+    ----------
+    row : dict[ID, Cell]
+    yid : ID
+    eid : ID
+
+    Returns
+    -------
+    int
+        The number of edge IDs in the cell after the insertion
+
+    """
+
+    if yid not in row:
+        row[yid] = eid
+        return 1
+    cell = row[yid]
+    if type(cell) is set:
+        cell.add(eid)
+        return len(cell)
+    row[yid] = {cell, eid}
+    return 2
+
+
+def _delete(row: dict[ID, Cell], yid: ID, eid: ID) -> int:
+    """Delete edge ID eid from the cell of yid in the adjacency row.
+
+    Parameters
+    ----------
+    row : dict[ID, Cell]
+    yid : ID
+    eid : ID
+
+    Returns
+    -------
+    int
+        The number of edge IDs in the cell after the deletion
+
+    """
+
+    cell = row[yid]
+    if type(cell) is not set:
+        del row[yid]
+        return 0
+    cell.remove(eid)
+    if len(cell) == 1:
+        row[yid] = next(iter(cell))
+        return 1
+    return len(cell)
+
+
+def _forward_id(uid: ID) -> ID:
+    """Get the ID of the forward edge of the undirected edge uid in a digraph.
+
+    Parameters
+    ----------
+    uid : ID
+
+    Returns
+    -------
+    ID
+        2 * uid if uid is an int, otherwise (uid, "f")
+
+    """
+
+    return uid << 1 if isinstance(uid, int) else (uid, "f")
+
+
+def _reverse_id(uid: ID) -> ID:
+    """Get the ID of the reverse edge of the undirected edge uid in a digraph.
+
+    Parameters
+    ----------
+    uid : ID
+
+    Returns
+    -------
+    ID
+        2 * uid + 1 if uid is an int, otherwise (uid, "r")
+
+    """
+
+    return (uid << 1) | 1 if isinstance(uid, int) else (uid, "r")
 
 
 class Graph:
@@ -19,7 +148,14 @@ class Graph:
     def __init__(self, nodes: list[Node] = None, edges: list[Link] = None) -> None:
         self.nodes: dict[ID, Node] = {}
         self.edges: dict[ID, Link] = {}
-        self.graph: dict[ID, dict[ID, set[ID]]] = {}  # node -> node -> edges
+        self.graph: dict[ID, dict[ID, Cell]] = {}  # node -> node -> edges
+        self._csr: tuple[list[ID], array, array, list[ID]] | None = None
+        self._node_cache: list[ID] | None = None
+        self._index_cache: dict[ID, int] | None = None
+        self._edge_cache: list[ID] | None = None
+        self._loops = 0  # number of loops
+        self._parallel = 0  # number of node pairs with parallel edges
+        self._degree: dict[ID, int] = {}  # node -> number of incident edges
 
         if nodes is not None:
             self.add_nodes(nodes)
@@ -63,7 +199,9 @@ class Graph:
             return None
 
         self.nodes[x.uid] = x
-        self.graph[x.uid] = defaultdict(set)
+        self.graph[x.uid] = {}
+        self._degree[x.uid] = 0
+        self._modified(nodes=True)
 
     def add_nodes(self, xs: list[Node]) -> None:
         """Add nodes xs to G.
@@ -90,18 +228,13 @@ class Graph:
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
         if xid not in self.nodes:
             return None
 
-        for yid in self.graph[xid]:
-            eids = self.graph[yid].pop(xid)
-            for eid in eids:
-                self.edges.pop(eid)
-        self.graph.pop(xid)
-
-        self.nodes.pop(xid)
+        self._detach_nodes({xid})
+        self._modified(nodes=True)
 
     def remove_nodes(self, xs: list[ID | Node]) -> None:
         """Remove nodes xs and their incident edges from G.
@@ -112,10 +245,49 @@ class Graph:
         ----------
         xs : list[ID | Node]
 
+        Implementation Note
+        -------------------
+        All of the nodes are removed in one sweep, so that an edge between two
+        removed nodes is only unlinked from the adjacency dictionaries once.
+
         """
 
-        for x in xs:
-            self.remove_node(x)
+        nodes = self.nodes
+        xids = {x.uid if x.__class__ is Node else x for x in xs}
+        xids = {xid for xid in xids if xid in nodes}
+
+        if not xids:
+            return None
+
+        self._detach_nodes(xids)
+        self._modified(nodes=True)
+
+    def _detach_nodes(self, xids: set[ID]) -> None:
+        """Remove the nodes xids of G and their incident edges from G.
+
+        Parameters
+        ----------
+        xids : set[ID]
+            The IDs of nodes in G
+
+        """
+
+        nodes, edges, graph, degree = self.nodes, self.edges, self.graph, self._degree
+        detached = set()
+        for xid in xids:
+            for yid, cell in graph.pop(xid).items():
+                if yid not in xids:
+                    del graph[yid][xid]
+                    degree[yid] -= _count(cell)
+                if yid not in detached:
+                    self._parallel -= _count(cell) > 1
+                if yid == xid:
+                    self._loops -= _count(cell)
+                for eid in _members(cell):
+                    edges.pop(eid, None)
+            detached.add(xid)
+            del nodes[xid]
+            del degree[xid]
 
     def get_node(self, xid: ID) -> Node | None:
         """Get node G with ID xid.
@@ -177,8 +349,8 @@ class Graph:
         if self.order < 1:
             raise ValueError("Cannot sample one node from G as G.order is 0.")
 
-        population = self.nodes.values() if as_nodes else self.nodes.keys()
-        return random.choice(list(population))
+        xid = random.choice(self._node_ids())
+        return self.nodes[xid] if as_nodes else xid
 
     def sample_nodes(self, k: int = 1, as_nodes: bool = False) -> list[ID] | list[Node]:
         """Sample k random nodes from G.
@@ -207,8 +379,10 @@ class Graph:
                 f"G has {self.order} nodes, cannot sample {k} > {self.order} nodes."
             )
 
-        population = self.nodes.values() if as_nodes else self.nodes.keys()
-        return random.sample(list(population), k)
+        if k == 1:
+            return [self.choose_node(as_nodes)]
+        xids = random.sample(self._node_ids(), k)
+        return [self.nodes[xid] for xid in xids] if as_nodes else xids
 
     def add_edge(self, e: Link) -> None:
         """Add edge e to G.
@@ -226,11 +400,14 @@ class Graph:
         if e.uid in self.edges:
             return None
 
-        self.add_nodes([Node(e.xid), Node(e.yid)])
+        if e.xid not in self.nodes:
+            self.add_node(Node(e.xid))
+        if e.yid not in self.nodes:
+            self.add_node(Node(e.yid))
 
         self.edges[e.uid] = e
-        self.graph[e.xid][e.yid].add(e.uid)
-        self.graph[e.yid][e.xid].add(e.uid)
+        self._attach_edge(e)
+        self._modified()
 
     def add_edges(self, es: list[Link]) -> None:
         """Add edges es to G.
@@ -241,10 +418,57 @@ class Graph:
         ----------
         es : list[Link]
 
+        Implementation Note
+        -------------------
+        The missing endpoints of es are collected and added in one call to
+        add_nodes before the edges are inserted, so that the per-edge work is
+        only the insertion into the edge and adjacency dictionaries.
+
+        Complexity
+        ----------
+        Space : O(len(es))
+        Time : O(len(es))
+
         """
 
+        nodes, edges = self.nodes, self.edges
+
+        added: dict[ID, Link] = {}
+        missing: dict[ID, Node] = {}
         for e in es:
-            self.add_edge(e)
+            if e.uid in edges or e.uid in added:
+                continue
+            added[e.uid] = e
+            if e.xid not in nodes and e.xid not in missing:
+                missing[e.xid] = Node(e.xid)
+            if e.yid not in nodes and e.yid not in missing:
+                missing[e.yid] = Node(e.yid)
+        if missing:
+            self.add_nodes(list(missing.values()))
+
+        edges.update(added)
+        attach = self._attach_edge
+        for e in added.values():
+            attach(e)
+        self._modified()
+
+    def _attach_edge(self, e: Link) -> None:
+        """Insert edge e into the adjacency dictionaries of G.
+
+        Parameters
+        ----------
+        e : Link
+
+        """
+
+        count = _insert(self.graph[e.xid], e.yid, e.uid)
+        self._degree[e.xid] += 1
+        if e.xid != e.yid:
+            _insert(self.graph[e.yid], e.xid, e.uid)
+            self._degree[e.yid] += 1
+        else:
+            self._loops += 1
+        self._parallel += count == 2
 
     def remove_edge(self, e: ID | Link) -> None:
         """Remove edge e from G.
@@ -257,15 +481,32 @@ class Graph:
 
         """
 
-        eid = e.uid if isinstance(e, Link) else e
+        eid = e.uid if e.__class__ is Link else e
 
         if eid not in self.edges:
             return None
 
-        e = self.edges[eid]
-        self.graph[e.xid][e.yid].remove(eid)
-        self.graph[e.yid][e.xid].remove(eid)
-        self.edges.pop(eid)
+        e = self.edges.pop(eid)
+        self._detach_edge(e)
+        self._modified()
+
+    def _detach_edge(self, e: Link) -> None:
+        """Remove edge e from the adjacency dictionaries of G.
+
+        Parameters
+        ----------
+        e : Link
+
+        """
+
+        count = _delete(self.graph[e.xid], e.yid, e.uid)
+        self._degree[e.xid] -= 1
+        if e.xid != e.yid:
+            _delete(self.graph[e.yid], e.xid, e.uid)
+            self._degree[e.yid] -= 1
+        else:
+            self._loops -= 1
+        self._parallel -= count == 1
 
     def remove_edges(self, es: list[ID | Link]) -> None:
         """Remove edges es from G.
@@ -341,8 +582,8 @@ class Graph:
         if self.size < 1:
             raise ValueError("Cannot sample one edge from G as G.size is 0.")
 
-        population = self.edges.values() if as_links else self.edges.keys()
-        return random.choice(list(population))
+        eid = random.choice(self._edge_ids())
+        return self.edges[eid] if as_links else eid
 
     def sample_edges(self, k: int = 1, as_links: bool = False) -> list[ID] | list[Link]:
         """Sample k random edges from G.
@@ -371,8 +612,10 @@ class Graph:
                 f"G has {self.size} edges, cannot sample {k} > {self.size} edges."
             )
 
-        population = self.edges.values() if as_links else self.edges.keys()
-        return random.sample(list(population), k)
+        if k == 1:
+            return [self.choose_edge(as_links)]
+        eids = random.sample(self._edge_ids(), k)
+        return [self.edges[eid] for eid in eids] if as_links else eids
 
     def get_edges_between(
         self, x: ID | Node, y: ID | Node, as_links: bool = False
@@ -398,18 +641,23 @@ class Graph:
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
-        yid = y.uid if isinstance(y, Node) else y
+        xid = x.uid if x.__class__ is Node else x
+        yid = y.uid if y.__class__ is Node else y
 
-        if xid not in self.nodes:
+        row = self.graph.get(xid)
+        if row is None:
             raise KeyError(f"Node with uid={xid} is not in G.")
-        if yid not in self.nodes:
-            raise KeyError(f"Node with uid={yid} is not in G.")
 
+        if yid in row:
+            eids = _members(row[yid])
+        elif yid in self.nodes:
+            eids = ()
+        else:
+            raise KeyError(f"Node with uid={yid} is not in G.")
         if as_links:
-            return [self.edges[eid] for eid in self.graph[xid].get(yid, [])]
+            return [self.edges[eid] for eid in eids]
         else:
-            return list(self.graph[xid].get(yid, []))
+            return list(eids)
 
     def adjacent(self, x: ID | Node, as_nodes: bool = False) -> list[ID] | list[Node]:
         """Get the adjacent nodes of x in G.
@@ -432,15 +680,17 @@ class Graph:
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
-        if xid not in self.nodes:
+        row = self.graph.get(xid)
+        if row is None:
             raise KeyError(f"Node with uid={xid} is not in G.")
 
         if as_nodes:
-            return [self.nodes[yid] for yid in self.graph[xid]]
+            nodes = self.nodes
+            return [nodes[yid] for yid in row]
         else:
-            return list(self.graph[xid])
+            return list(row)
 
     def incident(self, x: ID | Node, as_links: bool = False) -> list[ID] | list[Link]:
         """Get the incident edges of x in G.
@@ -463,18 +713,18 @@ class Graph:
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
-        if xid not in self.nodes:
+        row = self.graph.get(xid)
+        if row is None:
             raise KeyError(f"Node with uid={xid} is not in G.")
 
+        eids = chain.from_iterable(map(_members, row.values()))
         if as_links:
-            return [
-                self.edges[eid]
-                for eid in [eid for eids in self.graph[xid].values() for eid in eids]
-            ]
+            edges = self.edges
+            return [edges[eid] for eid in eids]
         else:
-            return [eid for eids in self.graph[xid].values() for eid in eids]
+            return list(eids)
 
     def neighbors(self, x: ID | Node, y: ID | Node) -> bool:
         """Check if y is a neighbor of x in G.
@@ -495,12 +745,11 @@ class Graph:
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
-        yid = y.uid if isinstance(y, Node) else y
+        xid = x.uid if x.__class__ is Node else x
+        yid = y.uid if y.__class__ is Node else y
 
-        if xid not in self.nodes or yid not in self.nodes:
-            return False
-        return yid in self.graph[xid]
+        row = self.graph.get(xid)
+        return row is not None and yid in row
 
     def degree(self, x: ID | Node) -> int:
         """Get the number of incident edges of x in G.
@@ -520,12 +769,12 @@ class Graph:
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
         if xid not in self.nodes:
             raise KeyError(f"Node with uid={xid} is not in G.")
 
-        return len(self.graph[xid])
+        return self._degree[xid]
 
     def contract_edge(self, e: ID | Link, key: str = "multinode") -> None:
         """Contract an edge e in G.
@@ -548,6 +797,9 @@ class Graph:
         this method will either add y to x.data[key] or merge y.data[key]
         with x.data[key].
 
+        The remaining edges of y are rewired to x in place and keep their IDs
+        and data, where any other edge between x and y becomes a loop on x.
+
         Warning
         -------
         To use this method without issues, ensure that the key provided is
@@ -555,7 +807,7 @@ class Graph:
 
         """
 
-        eid = e.uid if isinstance(e, Link) else e
+        eid = e.uid if e.__class__ is Link else e
 
         if eid not in self.edges:
             return None
@@ -569,10 +821,22 @@ class Graph:
 
         self.remove_edge(eid)
 
-        for zid in self.adjacent(yid):
-            edges = self.get_edges_between(yid, zid)
-            self.remove_edges(edges)
-            self.add_edges([Link(f.uid, xid, zid, f.data) for f in edges])
+        fids = set(self.incident(yid))
+        if self.is_directed:
+            fids.update(self.coincident(yid))
+
+        edges = self.edges
+        for fid in fids:
+            f = edges[fid]
+            self._detach_edge(f)
+            f = Link(
+                fid,
+                xid if f.xid == yid else f.xid,
+                xid if f.yid == yid else f.yid,
+                f.data,
+            )
+            edges[fid] = f
+            self._attach_edge(f)
 
         self.remove_node(yid)
 
@@ -593,14 +857,10 @@ class Graph:
 
         """
 
-        loops = []
-        for eid, e in self.edges.items():
-            if e.xid == e.yid:
-                if as_links:
-                    loops.append(e)
-                else:
-                    loops.append(eid)
-        return loops
+        if as_links:
+            return [e for e in self.edges.values() if e.xid == e.yid]
+        else:
+            return [eid for eid, e in self.edges.items() if e.xid == e.yid]
 
     def has_loops(self) -> bool:
         """Determine if G has any loops.
@@ -613,7 +873,7 @@ class Graph:
 
         """
 
-        return len(self.get_loops()) != 0
+        return self._loops > 0
 
     def remove_loops(self) -> None:
         """Remove all loops in G.
@@ -632,13 +892,14 @@ class Graph:
         -------
         bool
 
+        Complexity
+        ----------
+        Space : O(1)
+        Time : O(1)
+
         """
 
-        for xid in self.nodes:
-            for yid in self.adjacent(xid):
-                if len(self.get_edges_between(xid, yid)) > 1:
-                    return True
-        return False
+        return self._parallel > 0
 
     def is_simple(self) -> bool:
         """Determine if G is a simple graph.
@@ -716,16 +977,420 @@ class Graph:
 
         return C
 
-    def copy(self) -> Graph:
-        """Create a deepcopy of G.
+    def csr(self) -> tuple[list[ID], array, array, list[ID]]:
+        """Get the compressed sparse row (CSR) representation of G.
+
+        Returns
+        -------
+        nodes : list[ID]
+            The nodes of G, where node nodes[i] is numbered i
+        indptr : array
+            An array of n + 1 offsets, such that the edges incident to node i
+            are at positions indptr[i] to indptr[i + 1] of indices and edges
+        indices : array
+            The number of the adjacent node of each incident edge
+        edges : list[ID]
+            The ID of each incident edge
+
+        Notes
+        -----
+        - The representation is built on the first call and reused by later
+        calls until G is modified, so the returned containers must not be
+        modified by the caller.
+
+        - Each edge of G appears in the rows of both of its nodes, except for
+        loops which appear once.
+
+        Complexity
+        ----------
+        Space : O(n + m)
+        Time : O(n + m)
+
+        """
+
+        if self._csr is None:
+            self._csr = self._build_csr(self.graph)
+        return self._csr
+
+    def as_csr(
+        self, label: str | None = None
+    ) -> tuple[array, array, array | None, list[ID]]:
+        """Export G as compressed sparse row (CSR) arrays owned by the caller.
+
+        Parameters
+        ----------
+        label : str | None = None
+            The edge label to export as the weight of each edge
+
+        Returns
+        -------
+        indptr : array
+            An array of n + 1 offsets, such that the edges of node i are at
+            positions indptr[i] to indptr[i + 1] of indices and weights
+        indices : array
+            The number of the adjacent node of each edge
+        weights : array | None
+            The float value of label of each edge, or None if label is None
+        nodes : list[ID]
+            The nodes of G, where node nodes[i] is numbered i
+
+        Notes
+        -----
+        - The arrays are typed, contiguous and independent of G, so they can
+        be handed to compiled kernels, e.g. through numpy.frombuffer, and
+        modified freely.
+
+        Complexity
+        ----------
+        Space : O(n + m)
+        Time : O(n + m)
+
+        See Also
+        --------
+        from_csr : Build a graph from CSR arrays.
+
+        """
+
+        nodes, indptr, indices, eids = self.csr()
+
+        weights = None
+        if label is not None:
+            edges = self.edges
+            weights = array("d", [edges[eid][label] for eid in eids])
+
+        return array("q", indptr), array("q", indices), weights, list(nodes)
+
+    @classmethod
+    def from_csr(
+        cls,
+        indptr: list[int],
+        indices: list[int],
+        weights: list[Number] | None = None,
+        nodes: list[ID] | None = None,
+        label: str = "weight",
+    ) -> Graph:
+        """Build a graph from compressed sparse row (CSR) arrays.
+
+        Parameters
+        ----------
+        indptr : list[int]
+            An array of n + 1 offsets into indices and weights
+        indices : list[int]
+            The number of the adjacent node of each edge
+        weights : list[Number] | None = None
+            The weight of each edge, stored as the edge data under label
+        nodes : list[ID] | None = None
+            The ID of each node, defaults to range(n)
+        label : str = "weight"
+            The edge label to store weights under
+
+        Returns
+        -------
+        Graph
+            The edge IDs are the positions of the edges in indices
+
+        Notes
+        -----
+        - For an undirected graph, each edge must be in the rows of both of
+        its nodes, except for loops which appear once, as in as_csr. Only the
+        entry in the row of the smaller numbered node creates the edge.
+
+        Complexity
+        ----------
+        Space : O(n + m)
+        Time : O(n + m)
+
+        See Also
+        --------
+        as_csr : Export a graph as CSR arrays.
+
+        """
+
+        n = len(indptr) - 1
+        nodes = list(range(n)) if nodes is None else nodes
+
+        G = cls(create_nodes(nodes))
+        directed = G.is_directed
+
+        edges = []
+        for i in range(n):
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if directed or i <= j:
+                    data = {} if weights is None else {label: weights[k]}
+                    edges.append(Link(k, nodes[i], nodes[j], data))
+        G.add_edges(edges)
+
+        return G
+
+    def reorder(
+        self, order: Literal["rcm", "degree", "bfs"] | list[ID] = "rcm"
+    ) -> None:
+        """Renumber the nodes of G to improve the locality of its CSR arrays.
+
+        Parameters
+        ----------
+        order : Literal['rcm', 'degree', 'bfs'] | list[ID] = 'rcm'
+            Either an explicit permutation of the nodes of G, or one of
+            - 'rcm' : reverse Cuthill-McKee ordering, which keeps adjacent nodes
+            close together by numbering a breadth-first search from a minimum
+            degree node, visiting lower degree nodes first, in reverse
+            - 'degree' : nodes in decreasing order of degree
+            - 'bfs' : nodes in breadth-first search order
+
+        Raises
+        ------
+        ValueError
+            If order is a list that is not a permutation of the nodes of G or
+            order is not one of 'rcm', 'degree', 'bfs'
+
+        Notes
+        -----
+        - The new numbering is used by G.index, G.csr and G.as_csr, and is the
+        order in which G.get_nodes returns the nodes of G.
+
+        - The adjacency of a digraph is treated as undirected.
+
+        Complexity
+        ----------
+        Space : O(n + m)
+        Time : O(n•log(n) + m•log(m))
+
+        """
+
+        if isinstance(order, str):
+            if order == "rcm":
+                order = self._search_order(True)[::-1]
+            elif order == "degree":
+                order = sorted(self.nodes, key=self.degree, reverse=True)
+            elif order == "bfs":
+                order = self._search_order(False)
+            else:
+                raise ValueError(
+                    f"order={order} must be one of 'rcm', 'degree', 'bfs' or a list."
+                )
+        elif len(order) != self.order or set(order) != self.nodes.keys():
+            raise ValueError("order must be a permutation of the nodes of G.")
+
+        self.nodes = {xid: self.nodes[xid] for xid in order}
+        self._modified(nodes=True)
+
+    def _search_order(self, by_degree: bool) -> list[ID]:
+        """Get the breadth-first search order of the nodes of G.
+
+        Parameters
+        ----------
+        by_degree : bool
+            Indicates whether each search starts from a minimum degree node
+            and visits the neighbors of each node in increasing degree order
+
+        Returns
+        -------
+        list[ID]
+
+        """
+
+        def around(xid: ID) -> list[ID]:
+            ys = self.adjacent(xid)
+            if self.is_directed:
+                ys = list(dict.fromkeys(ys + self.coadjacent(xid)))
+            return sorted(ys, key=self.degree) if by_degree else ys
+
+        starts = sorted(self.nodes, key=self.degree) if by_degree else self.nodes
+
+        order = []
+        explored = set()
+        for s in starts:
+            if s in explored:
+                continue
+            explored.add(s)
+            queue = deque([s])
+            while queue:
+                x = queue.popleft()
+                order.append(x)
+                for y in around(x):
+                    if y not in explored:
+                        explored.add(y)
+                        queue.append(y)
+
+        return order
+
+    def _build_csr(
+        self, graph: dict[ID, dict[ID, Cell]]
+    ) -> tuple[list[ID], array, array, list[ID]]:
+        """Build the CSR representation of the adjacency dictionary graph.
+
+        Parameters
+        ----------
+        graph : dict[ID, dict[ID, Cell]]
+
+        Returns
+        -------
+        tuple[list[ID], array, array, list[ID]]
+
+        """
+
+        nodes = self._node_ids()
+        index = self.index()
+
+        indptr = array("q", [0])
+        indices = array("q")
+        edges: list[ID] = []
+        for x in nodes:
+            for y, cell in graph[x].items():
+                if type(cell) is set:
+                    indices.extend([index[y]] * len(cell))
+                    edges.extend(cell)
+                else:
+                    indices.append(index[y])
+                    edges.append(cell)
+            indptr.append(len(edges))
+
+        return nodes, indptr, indices, edges
+
+    def index(self) -> dict[ID, int]:
+        """Get the dense integer number of each node of G.
+
+        Returns
+        -------
+        dict[ID, int]
+            The number i in [0, n) of each node, such that the node numbered
+            i is G.csr()[0][i]
+
+        Notes
+        -----
+        - The numbering is built on the first call and reused by later calls
+        until a node is added to or removed from G, so the returned dictionary
+        must not be modified by the caller.
+
+        Complexity
+        ----------
+        Space : O(n)
+        Time : O(n)
+
+        """
+
+        if self._index_cache is None:
+            self._index_cache = {x: i for i, x in enumerate(self._node_ids())}
+        return self._index_cache
+
+    def _node_ids(self) -> list[ID]:
+        """Get the cached list of the node IDs of G used for sampling.
+
+        Returns
+        -------
+        list[ID]
+
+        """
+
+        if self._node_cache is None:
+            self._node_cache = list(self.nodes)
+        return self._node_cache
+
+    def _edge_ids(self) -> list[ID]:
+        """Get the cached list of the edge IDs of G used for sampling.
+
+        Returns
+        -------
+        list[ID]
+
+        """
+
+        if self._edge_cache is None:
+            self._edge_cache = list(self.edges)
+        return self._edge_cache
+
+    def _modified(self, nodes: bool = False) -> None:
+        """Discard the cached representations of G after G is modified.
+
+        Parameters
+        ----------
+        nodes : bool = False
+            Indicates whether the nodes of G were modified, otherwise only the
+            edges of G were modified
+
+        """
+
+        self._csr = None
+        self._edge_cache = None
+        if nodes:
+            self._node_cache = None
+            self._index_cache = None
+
+    def copy(self, deep: bool = True) -> Graph:
+        """Create a copy of G.
+
+        Parameters
+        ----------
+        deep : bool = True
+            Indicates whether to deepcopy the data of each node and edge,
+            otherwise the copies share the values of their data dictionaries
 
         Returns
         -------
         Graph
 
+        Implementation Note
+        -------------------
+        The nodes, edges and adjacency dictionaries are rebuilt directly, so
+        copy.deepcopy is only ever applied to the node and edge data.
+
+        Complexity
+        ----------
+        Space : O(n + m)
+        Time : O(n + m)
+
         """
 
-        return copy.deepcopy(self)
+        C = self.__class__()
+        C.nodes, C.edges = self._copy_elements(deep)
+        C.graph = self._copy_adjacency(self.graph)
+        C._loops, C._parallel = self._loops, self._parallel
+        C._degree = self._degree.copy()
+        return C
+
+    def _copy_elements(self, deep: bool) -> tuple[dict[ID, Node], dict[ID, Link]]:
+        """Copy the nodes and edges of G with fresh data dictionaries.
+
+        Parameters
+        ----------
+        deep : bool
+            Indicates whether to deepcopy the data of each node and edge
+
+        Returns
+        -------
+        tuple[dict[ID, Node], dict[ID, Link]]
+
+        """
+
+        clone = partial(copy.deepcopy, memo={}) if deep else dict
+
+        nodes = {uid: Node(uid, clone(x.data)) for uid, x in self.nodes.items()}
+        edges = {
+            uid: Link(uid, e.xid, e.yid, clone(e.data)) for uid, e in self.edges.items()
+        }
+        return nodes, edges
+
+    @staticmethod
+    def _copy_adjacency(
+        graph: dict[ID, dict[ID, Cell]],
+    ) -> dict[ID, dict[ID, Cell]]:
+        """Copy the adjacency dictionary graph.
+
+        Parameters
+        ----------
+        graph : dict[ID, dict[ID, Cell]]
+
+        Returns
+        -------
+        dict[ID, dict[ID, Cell]]
+
+        """
+
+        return {
+            xid: {yid: set(c) if type(c) is set else c for yid, c in row.items()}
+            for xid, row in graph.items()
+        }
 
     def clear(self) -> None:
         """Remove all nodes and edges from G."""
@@ -733,6 +1398,9 @@ class Graph:
         self.nodes.clear()
         self.edges.clear()
         self.graph.clear()
+        self._degree.clear()
+        self._loops = self._parallel = 0
+        self._modified(nodes=True)
 
     def to_undirected(self) -> Graph:
         """Get the undirected graph of G.
@@ -763,15 +1431,23 @@ class Graph:
         ----
         If G is a directed graph then this method will return a shallow of G.
         Otherwise, for each edge e in the undirected graph G their IDs in D
-        will be (0, e.uid) and (1, e.uid) for the forward and reverse edges in
-        D, respectively, but e.data will be the same on both edges.
+        will be 2 * e.uid and 2 * e.uid + 1 for the forward and reverse edges
+        in D, respectively, if e.uid is an int, and (e.uid, "f") and
+        (e.uid, "r") otherwise, but e.data will be the same on both edges.
 
         """
 
-        D = DiGraph()
-        for e in self.edges:
-            D.add_edge(Link((0, e.uid), e.xid, e.yid, e.data))
-            D.add_edge(Link((1, e.uid), e.yid, e.xid, e.data))
+        D = DiGraph(list(self.nodes.values()))
+        D.add_edges(
+            [
+                Link(_forward_id(e.uid), e.xid, e.yid, e.data)
+                for e in self.edges.values()
+            ]
+            + [
+                Link(_reverse_id(e.uid), e.yid, e.xid, e.data)
+                for e in self.edges.values()
+            ]
+        )
         return D
 
     @property
@@ -876,7 +1552,7 @@ class Graph:
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
         return xid in self.nodes
 
@@ -898,8 +1574,17 @@ class DiGraph(Graph):
     def __init__(self, nodes: list[Node] = None, edges: list[Link] = None) -> None:
         self.nodes: dict[ID, Node] = {}
         self.edges: dict[ID, Link] = {}
-        self.forwardG: dict[ID, dict[ID, set[ID]]] = {}  # node -> node -> edges
-        self.reverseG: dict[ID, dict[ID, set[ID]]] = {}  # node -> node -> edges
+        self.forwardG: dict[ID, dict[ID, Cell]] = {}  # node -> node -> edges
+        self.reverseG: dict[ID, dict[ID, Cell]] = {}  # node -> node -> edges
+        self._csr: tuple[list[ID], array, array, list[ID]] | None = None
+        self._node_cache: list[ID] | None = None
+        self._index_cache: dict[ID, int] | None = None
+        self._edge_cache: list[ID] | None = None
+        self._loops = 0  # number of loops
+        self._parallel = 0  # number of node pairs with parallel edges
+        self._degree: dict[ID, int] = {}  # node -> number of out edges
+        self._codegree: dict[ID, int] = {}  # node -> number of in edges
+        self._cocsr: tuple[list[ID], array, array, list[ID]] | None = None
 
         if nodes is not None:
             self.add_nodes(nodes)
@@ -911,77 +1596,118 @@ class DiGraph(Graph):
             return None
 
         self.nodes[x.uid] = x
-        self.forwardG[x.uid] = defaultdict(set)
-        self.reverseG[x.uid] = defaultdict(set)
+        self.forwardG[x.uid] = {}
+        self.reverseG[x.uid] = {}
+        self._degree[x.uid] = 0
+        self._codegree[x.uid] = 0
+        self._modified(nodes=True)
 
     def remove_node(self, x: ID | Node) -> None:
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
         if xid not in self.nodes:
             return None
 
-        for yid in self.forwardG[xid]:
-            eids = self.reverseG[yid].pop(xid)
-            for eid in eids:
-                self.edges.pop(eid)
-        self.forwardG.pop(xid)
-
-        for yid in self.reverseG[xid]:
-            eids = self.forwardG[yid].pop(xid)
-            for eid in eids:
-                self.edges.pop(eid)
-        self.reverseG.pop(xid)
-
-        self.nodes.pop(xid)
+        self._detach_nodes({xid})
+        self._modified(nodes=True)
+
+    def _detach_nodes(self, xids: set[ID]) -> None:
+        nodes, edges = self.nodes, self.edges
+        forwardG, reverseG = self.forwardG, self.reverseG
+        degree, codegree = self._degree, self._codegree
+        for xid in xids:
+            for yid, cell in forwardG.pop(xid).items():
+                if yid not in xids:
+                    del reverseG[yid][xid]
+                    codegree[yid] -= _count(cell)
+                self._parallel -= _count(cell) > 1
+                if yid == xid:
+                    self._loops -= _count(cell)
+                for eid in _members(cell):
+                    edges.pop(eid, None)
+            for yid, cell in reverseG.pop(xid).items():
+                if yid not in xids:
+                    del forwardG[yid][xid]
+                    degree[yid] -= _count(cell)
+                    self._parallel -= _count(cell) > 1
+                for eid in _members(cell):
+                    edges.pop(eid, None)
+            del nodes[xid]
+            del degree[xid]
+            del codegree[xid]
 
     def add_edge(self, e: Link) -> None:
         if e.uid in self.edges:
             return None
 
-        self.add_nodes([Node(e.xid), Node(e.yid)])
+        if e.xid not in self.nodes:
+            self.add_node(Node(e.xid))
+        if e.yid not in self.nodes:
+            self.add_node(Node(e.yid))
 
         self.edges[e.uid] = e
-        self.forwardG[e.xid][e.yid].add(e.uid)
-        self.reverseG[e.yid][e.xid].add(e.uid)
+        self._attach_edge(e)
+        self._modified()
+
+    def _attach_edge(self, e: Link) -> None:
+        count = _insert(self.forwardG[e.xid], e.yid, e.uid)
+        _insert(self.reverseG[e.yid], e.xid, e.uid)
+        self._degree[e.xid] += 1
+        self._codegree[e.yid] += 1
+        self._parallel += count == 2
+        self._loops += e.xid == e.yid
 
     def remove_edge(self, e: ID | Link) -> None:
-        eid = e.uid if isinstance(e, Link) else e
+        eid = e.uid if e.__class__ is Link else e
 
         if eid not in self.edges:
             return None
 
-        e = self.edges[eid]
+        e = self.edges.pop(eid)
+        self._detach_edge(e)
+        self._modified()
 
-        self.forwardG[e.xid][e.yid].remove(eid)
-        self.reverseG[e.yid][e.xid].remove(eid)
-        self.edges.pop(eid)
+    def _detach_edge(self, e: Link) -> None:
+        count = _delete(self.forwardG[e.xid], e.yid, e.uid)
+        _delete(self.reverseG[e.yid], e.xid, e.uid)
+        self._degree[e.xid] -= 1
+        self._codegree[e.yid] -= 1
+        self._parallel -= count == 1
+        self._loops -= e.xid == e.yid
 
     def get_edges_between(
         self, x: ID | Node, y: ID | Node, as_links: bool = False
     ) -> list[Link]:
-        xid = x.uid if isinstance(x, Node) else x
-        yid = y.uid if isinstance(y, Node) else y
+        xid = x.uid if x.__class__ is Node else x
+        yid = y.uid if y.__class__ is Node else y
 
-        if xid not in self.nodes:
+        row = self.forwardG.get(xid)
+        if row is None:
             raise KeyError(f"Node with uid={xid} is not in G.")
-        if yid not in self.nodes:
-            raise KeyError(f"Node with uid={yid} is not in G.")
 
+        if yid in row:
+            eids = _members(row[yid])
+        elif yid in self.nodes:
+            eids = ()
+        else:
+            raise KeyError(f"Node with uid={yid} is not in G.")
         if as_links:
-            return [self.edges[eid] for eid in self.forwardG[xid].get(yid, [])]
+            return [self.edges[eid] for eid in eids]
         else:
-            return list(self.forwardG[xid].get(yid, []))
+            return list(eids)
 
     def adjacent(self, x: ID | Node, as_nodes: bool = False) -> list[ID] | list[Node]:
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
-        if xid not in self.nodes:
+        row = self.forwardG.get(xid)
+        if row is None:
             raise KeyError(f"Node with uid={xid} is not in G.")
 
         if as_nodes:
-            return [self.nodes[yid] for yid in self.forwardG[xid]]
+            nodes = self.nodes
+            return [nodes[yid] for yid in row]
         else:
-            return list(self.forwardG[xid])
+            return list(row)
 
     def coadjacent(
         self, x: ID | Node, as_nodes: bool = False
@@ -1009,29 +1735,31 @@ class DiGraph(Graph):
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
-        if xid not in self.nodes:
+        row = self.reverseG.get(xid)
+        if row is None:
             raise KeyError(f"Node with uid={xid} is not in G.")
 
         if as_nodes:
-            return [self.nodes[yid] for yid in self.reverseG[xid]]
+            nodes = self.nodes
+            return [nodes[yid] for yid in row]
         else:
-            return list(self.reverseG[xid])
+            return list(row)
 
     def incident(self, x: ID | Node, as_links: bool = False) -> list[ID] | list[Link]:
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
-        if xid not in self.nodes:
+        row = self.forwardG.get(xid)
+        if row is None:
             raise KeyError(f"Node with uid={xid} is not in G.")
 
+        eids = chain.from_iterable(map(_members, row.values()))
         if as_links:
-            return [
-                self.edges[eid]
-                for eid in [eid for eids in self.forwardG[xid].values() for eid in eids]
-            ]
+            edges = self.edges
+            return [edges[eid] for eid in eids]
         else:
-            return [eid for eids in self.forwardG[xid].values() for eid in eids]
+            return list(eids)
 
     def coincident(self, x: ID | Node, as_links: bool = False) -> list[ID] | list[Link]:
         """Get the coincident edges of x in G.
@@ -1057,26 +1785,25 @@ class DiGraph(Graph):
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
-        if xid not in self.nodes:
+        row = self.reverseG.get(xid)
+        if row is None:
             raise KeyError(f"Node with uid={xid} is not in G.")
 
+        eids = chain.from_iterable(map(_members, row.values()))
         if as_links:
-            return [
-                self.edges[eid]
-                for eid in [eid for eids in self.reverseG[xid].values() for eid in eids]
-            ]
+            edges = self.edges
+            return [edges[eid] for eid in eids]
         else:
-            return [eid for eids in self.reverseG[xid].values() for eid in eids]
+            return list(eids)
 
     def neighbors(self, x: ID | Node, y: ID | Node) -> bool:
-        xid = x.uid if isinstance(x, Node) else x
-        yid = y.uid if isinstance(y, Node) else y
+        xid = x.uid if x.__class__ is Node else x
+        yid = y.uid if y.__class__ is Node else y
 
-        if xid not in self.nodes or yid not in self.nodes:
-            return False
-        return yid in self.forwardG[xid]
+        row = self.forwardG.get(xid)
+        return row is not None and yid in row
 
     def coneighbors(self, x: ID | Node, y: ID | Node) -> bool:
         """Check if y is a neighbor of x in G.
@@ -1097,20 +1824,19 @@ class DiGraph(Graph):
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
-        yid = y.uid if isinstance(y, Node) else y
+        xid = x.uid if x.__class__ is Node else x
+        yid = y.uid if y.__class__ is Node else y
 
-        if xid not in self.nodes or yid not in self.nodes:
-            return False
-        return yid in self.reverseG[xid]
+        row = self.reverseG.get(xid)
+        return row is not None and yid in row
 
     def degree(self, x: ID | Node) -> int:
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
         if xid not in self.nodes:
             raise KeyError(f"Node with uid={xid} is not in G.")
 
-        return sum([len(es) for es in self.forwardG[xid].values()])
+        return self._degree[xid]
 
     def codegree(self, x: ID | Node) -> int:
         """Get the number of coincident edges of x in G.
@@ -1130,29 +1856,91 @@ class DiGraph(Graph):
 
         """
 
-        xid = x.uid if isinstance(x, Node) else x
+        xid = x.uid if x.__class__ is Node else x
 
         if xid not in self.nodes:
             raise KeyError(f"Node with uid={xid} is not in G.")
 
-        return sum([len(es) for es in self.reverseG[xid].values()])
+        return self._codegree[xid]
+
+    def csr(self) -> tuple[list[ID], array, array, list[ID]]:
+        if self._csr is None:
+            self._csr = self._build_csr(self.forwardG)
+        return self._csr
+
+    def cocsr(self) -> tuple[list[ID], array, array, list[ID]]:
+        """Get the compressed sparse row (CSR) representation of the transpose of D.
+
+        Returns
+        -------
+        nodes : list[ID]
+            The nodes of D, where node nodes[i] is numbered i
+        indptr : array
+            An array of n + 1 offsets, such that the coincident edges of node i
+            are at positions indptr[i] to indptr[i + 1] of indices and edges
+        indices : array
+            The number of the coadjacent node of each coincident edge
+        edges : list[ID]
+            The ID of each coincident edge
+
+        Notes
+        -----
+        - The representation is built on the first call and reused by later
+        calls until D is modified, so the returned containers must not be
+        modified by the caller.
+
+        Complexity
+        ----------
+        Space : O(n + m)
+        Time : O(n + m)
+
+        """
+
+        if self._cocsr is None:
+            self._cocsr = self._build_csr(self.reverseG)
+        return self._cocsr
 
-    def copy(self) -> DiGraph:
-        """Create a deepcopy of D.
+    def _modified(self, nodes: bool = False) -> None:
+        super()._modified(nodes)
+        self._cocsr = None
+
+    def copy(self, deep: bool = True) -> DiGraph:
+        """Create a copy of D.
+
+        Parameters
+        ----------
+        deep : bool = True
+            Indicates whether to deepcopy the data of each node and edge,
+            otherwise the copies share the values of their data dictionaries
 
         Returns
         -------
         DiGraph
 
+        Complexity
+        ----------
+        Space : O(n + m)
+        Time : O(n + m)
+
         """
 
-        return super().copy()
+        C = self.__class__()
+        C.nodes, C.edges = self._copy_elements(deep)
+        C.forwardG = self._copy_adjacency(self.forwardG)
+        C.reverseG = self._copy_adjacency(self.reverseG)
+        C._loops, C._parallel = self._loops, self._parallel
+        C._degree, C._codegree = self._degree.copy(), self._codegree.copy()
+        return C
 
     def clear(self) -> None:
         self.nodes.clear()
         self.edges.clear()
         self.forwardG.clear()
         self.reverseG.clear()
+        self._degree.clear()
+        self._codegree.clear()
+        self._loops = self._parallel = 0
+        self._modified(nodes=True)
 
     def transpose(self, inplace: bool = True) -> DiGraph:
         """Reverse the edges of D.
@@ -1175,6 +1963,8 @@ class DiGraph(Graph):
         for e in D.get_edges(as_links=True):
             D.edges[e.uid] = Link(e.uid, e.yid, e.xid, e.data)
         D.forwardG, D.reverseG = D.reverseG, D.forwardG
+        D._degree, D._codegree = D._codegree, D._degree
+        D._modified()
 
         return D
 
@@ -1220,10 +2010,7 @@ class DiGraph(Graph):
         return super().complement(inplace=inplace, include_loops=include_loops)
 
     def to_undirected(self) -> Graph:
-        G = Graph()
-        for e in self.edges:
-            G.add_edge(e)
-        return G
+        return Graph(list(self.nodes.values()), list(self.edges.values()))
 
     def to_directed(self) -> DiGraph:
         return self
@@ -5,10 +5,13 @@ update : @tarickali 24/01/01
 """
 
 from __future__ import annotations
-from typing import Literal, Any
+from typing import Literal, Any, Iterator
+from operator import le, ge
 
 from compkit.core import ID, Node
 
+_SMALL = 1 << 16  # heaps smaller than this use the linear sweep in heapify
+
 
 class Heap:
     """Vanilla heap data structure.
@@ -21,6 +24,16 @@ class Heap:
     This data structure supports both min and max heaps, based on the mode
     parameter given at initialization.
 
+    The label value of an item is read once when the item enters the heap and
+    is kept in a list parallel to the items, so comparisons do not look up the
+    data dictionaries. Changes to the label value of an item in the heap must
+    therefore go through the modify method.
+
+    The items are stored as a 4-ary heap, so the children of the item at
+    index i are at indices 4i + 1, ..., 4i + 4 and its parent is at index
+    (i - 1) // 4. This halves the height of the tree compared to a binary
+    heap, so insertions and deletions touch half as many levels.
+
     Notation
     --------
     H : the heap data structure.
@@ -35,6 +48,7 @@ class Heap:
         self.mode = mode
 
         self.items: list[Node] = []
+        self.keys: list[Any] = []  # keys[idx] = items[idx].data[label]
         self.indices: dict[ID, int] = {}  # f : ID -> idx in self.items
 
     @staticmethod
@@ -53,6 +67,12 @@ class Heap:
         -------
         Heap
 
+        Implementation Note
+        -------------------
+        For n >= 2^16, the subtrees are heapified in post-order rather than in
+        decreasing index order, which performs the same comparisons but sifts
+        each parent right after its children while they are still in cache.
+
         Complexity
         ----------
         Space : O(n)
@@ -62,15 +82,10 @@ class Heap:
 
         heap = Heap(label, mode)
 
-        heap.items = [None] * len(items)
-        for idx, item in enumerate(items):
-            heap.items[idx] = item
-            heap.indices[item.uid] = idx
-
-        idx = heap._parent(heap.size() - 1)
-        while idx >= 0:
-            heap._bubble_down(idx)
-            idx -= 1
+        heap.items = list(items)
+        heap.keys = [item.data[label] for item in items]
+        heap.indices = {item.uid: idx for idx, item in enumerate(items)}
+        heap._heapify_from(0)
 
         return heap
 
@@ -116,6 +131,13 @@ class Heap:
         As such to find the item's original ID after k merges one only needs
         to index the 0th index of merged item's ID.
 
+        Implementation Note
+        -------------------
+        The largest heap in heaps that is already a {mode}-heap on label is
+        placed first and keeps its order, so only the ancestors of the items
+        of the other heaps are sifted. The keys of the heaps on label are
+        reused rather than read from the data of the items again.
+
         Furthermore, although the items in the new Heap are new Node objects
         with different IDs, they share the same data dictionary since a shallow
         copy is used to construct the new items.
@@ -127,15 +149,31 @@ class Heap:
 
         """
 
-        merged_items: list[Node] = []
-        for i, heap in enumerate(heaps):
+        order = list(range(len(heaps)))
+        ordered = [
+            i for i in order if heaps[i].label == label and heaps[i].mode == mode
+        ]
+        base = max(ordered, key=lambda i: heaps[i].size(), default=None)
+        if base is not None:
+            order.remove(base)
+            order.insert(0, base)
+
+        merged_heap = Heap(label, mode)
+        merged_items, merged_keys = merged_heap.items, merged_heap.keys
+        for i in order:
+            heap = heaps[i]
             for item in heap.items:
                 if not merged:
                     merged_items.append(Node((item.uid, i), item.data))
                 else:
                     merged_items.append(Node(item.uid + (i,), item.data))
+            if heap.label == label:
+                merged_keys.extend(heap.keys)
+            else:
+                merged_keys.extend(item.data[label] for item in heap.items)
 
-        merged_heap = Heap.heapify(merged_items, label, mode)
+        merged_heap.indices = {item.uid: idx for idx, item in enumerate(merged_items)}
+        merged_heap._heapify_from(0 if base is None else heaps[base].size())
 
         return merged_heap
 
@@ -179,6 +217,7 @@ class Heap:
             return None
 
         self.items.append(item)
+        self.keys.append(item.data[self.label])
         self.indices[item.uid] = self.size() - 1
 
         self._bubble_up(self.size() - 1)
@@ -202,11 +241,43 @@ class Heap:
         if self.size() == 0:
             return None
 
-        root = self.root()
-        self.delete(root)
+        root = self.items[0]
+        last, key = self.items.pop(), self.keys.pop()
+        self.indices.pop(root.uid)
+
+        if self.size() > 0:
+            self._sift_down_with(0, last, key)
 
         return root
 
+    def drain(self) -> Iterator[Node]:
+        """Extract the items of H one at a time, in {mode} order.
+
+        Each item is deleted from H when it is yielded, so H is empty once the
+        iterator is exhausted.
+
+        Returns
+        -------
+        Iterator[Node]
+
+        Complexity
+        ----------
+        Space : O(1)
+        Time : O(n•log n)
+
+        """
+
+        # The body of extract, inlined to save a method call per item. The
+        # attributes are read on every step in case H is modified in between.
+        while self.items:
+            items = self.items
+            root = items[0]
+            last, key = items.pop(), self.keys.pop()
+            self.indices.pop(root.uid)
+            if items:
+                self._sift_down_with(0, last, key)
+            yield root
+
     def get_item(self, uid: ID) -> Node | None:
         """Return item with ID uid from H.
 
@@ -228,7 +299,7 @@ class Heap:
         """
 
         item_idx = self.indices.get(uid)
-        if item_idx == None:
+        if item_idx is None:
             return None
         return self.items[item_idx]
 
@@ -262,8 +333,9 @@ class Heap:
         if self.size() == 0:
             return None
         else:
-            root = self.root()
-            self.replace(self.items[0], item)
+            root = self.items[0]
+            self.indices.pop(root.uid)
+            self._sift_down_with(0, item, item.data[self.label])
             return root
 
     def replace(self, old: ID | Node, new: Node) -> None:
@@ -286,17 +358,11 @@ class Heap:
         oid = old.uid if isinstance(old, Node) else old
 
         old_idx = self.indices.get(oid)
-        if old_idx == None:
+        if old_idx is None:
             return None
 
-        self.items[old_idx] = new
         self.indices.pop(oid)
-        self.indices[new.uid] = old_idx
-
-        # Note only one of the methods below will run, since invariant
-        # changes in only one direction.
-        self._bubble_up(old_idx)
-        self._bubble_down(old_idx)
+        self._sift_with(old_idx, new, new.data[self.label])
 
     def delete(self, item: ID | Node) -> None:
         """Delete item from H.
@@ -317,17 +383,15 @@ class Heap:
         nid = item.uid if isinstance(item, Node) else item
 
         idx = self.indices.get(nid)
-        if idx == None:
+        if idx is None:
             return None
 
-        self._swap(idx, self.size() - 1)
-        self.items.pop()
         self.indices.pop(nid)
+        last, key = self.items.pop(), self.keys.pop()
 
-        # Note only one of the methods below will run, since invariant
-        # changes in only one direction.
-        self._bubble_up(idx)
-        self._bubble_down(idx)
+        # The last item fills the hole, unless it was the deleted item.
+        if idx < self.size():
+            self._sift_with(idx, last, key)
 
     def modify(self, uid: ID, data: dict[str, Any]) -> None:
         """Modify data of the item with the given ID.
@@ -339,6 +403,12 @@ class Heap:
         uid : ID
         data : dict[str, Any]
 
+        Note
+        ----
+        The position of the item is looked up in self.indices, so the item is
+        sifted from its index without searching H. Since the ID of the item
+        does not change, self.indices does not need to be updated.
+
         Complexity
         ----------
         Space : O(1)
@@ -346,7 +416,11 @@ class Heap:
 
         """
 
-        self.replace(uid, Node(uid, data))
+        idx = self.indices.get(uid)
+        if idx is None:
+            return None
+
+        self._sift_with(idx, Node(uid, data), data[self.label])
 
     def size(self) -> int:
         """Get the number of items in H.
@@ -391,6 +465,7 @@ class Heap:
         """
 
         self.items = []
+        self.keys = []
         self.indices = {}
 
     def __getitem__(self, uid: ID) -> Node | None:
@@ -448,82 +523,61 @@ class Heap:
 
         return self.size()
 
-    def _parent(self, idx: int) -> int | None:
-        """Get the parent index of idx in H.
+    def _heapify_from(self, start: int) -> None:
+        """Restore invariant of H, given that it holds for the items before start.
 
-        If idx is 0 (i.e. the root index), then this method returns None.
+        The items from start onwards that have children, and then the ancestors
+        of the items from start onwards, are sifted down in decreasing index
+        order. The ancestors of a range of indices form a range on the level
+        above, so each level is a single contiguous sweep. For start = 0 this
+        is the bottom-up construction of H.
 
         Parameters
         ----------
-        idx : int
-
-        Returns
-        -------
-        int | None
+        start : int
 
         Complexity
         ----------
         Space : O(1)
-        Time : O(1)
+        Time : O(n - start + log(n)^2)
 
         """
 
-        if idx == 0:
+        n = self.size()
+        if start >= n:
             return None
-        return (idx - 1) // 2
-
-    def _left(self, idx: int) -> int | None:
-        """Get the left child index of idx in H.
-
-        If the given idx has no left child, then this method will return None.
-
-        Parameters
-        ----------
-        idx : int
-
-        Returns
-        -------
-        int | None
-
-        Complexity
-        ----------
-        Space : O(1)
-        Time : O(1)
-
-        """
 
-        child = 2 * (idx + 1) - 1
-        if child >= self.size():
+        if start == 0 and n >= _SMALL:
+            # Sweep only the parents of leaves, and walk up to a parent as soon
+            # as all of its children that are parents have been sifted, so that
+            # each subtree is heapified while its children were just touched.
+            last = (n - 2) // 4
+            ready = bytearray(last + 1)  # number of sifted children of each parent
+            for idx in range(last, (last - 1) // 4, -1):
+                self._bubble_down(idx)
+                while idx > 0:
+                    idx = (idx - 1) >> 2
+                    ready[idx] += 1
+                    if ready[idx] < min(4, last - 4 * idx):
+                        break
+                    self._bubble_down(idx)
             return None
-        return child
 
-    def _right(self, idx: int) -> int | None:
-        """Get the right child index of idx in H.
+        for idx in range((n - 2) // 4, start - 1, -1):
+            self._bubble_down(idx)
 
-        If the given idx has no right child, then this method will return None.
-
-        Parameters
-        ----------
-        idx : int
-
-        Returns
-        -------
-        int | None
-
-        Complexity
-        ----------
-        Space : O(1)
-        Time : O(1)
-
-        """
-
-        child = 2 * (idx + 1)
-        if child >= self.size():
-            return None
-        return child
+        lo, hi = start, n - 1
+        while lo > 0:
+            lo, hi = (lo - 1) >> 2, min((hi - 1) >> 2, lo - 1)
+            for idx in range(hi, lo - 1, -1):
+                self._bubble_down(idx)
 
     def _bubble_up(self, idx: int) -> None:
-        """Restore invariant of H from idx by swapping items upwards.
+        """Restore invariant of H from idx by moving the item at idx upwards.
+
+        The item at idx is lifted out, leaving a hole at idx. Each step moves
+        the parent of the hole down into the hole with a single assignment,
+        and the item is written into H once at its final index.
 
         Parameters
         ----------
@@ -536,19 +590,24 @@ class Heap:
 
         """
 
-        c = idx
-        p = self._parent(idx)
+        items, keys, indices = self.items, self.keys, self.indices
+        compare = le if self.mode == "min" else ge
+        item, key = items[idx], keys[idx]
 
-        while p != None:
-            if self._compare(self.items[c], self.items[p]):
-                self._swap(c, p)
-                c = p
-                p = self._parent(c)
-            else:
+        while idx > 0:
+            parent = (idx - 1) >> 2
+            if not compare(key, keys[parent]):
                 break
+            above = items[parent]
+            items[idx], keys[idx] = above, keys[parent]
+            indices[above.uid] = idx
+            idx = parent
+
+        items[idx], keys[idx] = item, key
+        indices[item.uid] = idx
 
     def _bubble_down(self, idx: int) -> None:
-        """Restore invariant of H from idx by swapping items downwards.
+        """Restore invariant of H from idx by moving the item at idx downwards.
 
         Parameters
         ----------
@@ -561,84 +620,89 @@ class Heap:
 
         """
 
-        def helper(i: int, j: int) -> int:
-            """Restores heap invariant between two item indices.
-
-            This method swaps the item at index i with the item at index j
-            if item i is meant to be the parent of item j in H. In either
-            case, this method will return the index of the parent
-            item between indices i and j.
-
-            Parameters
-            ----------
-            i : int
-            j : int
-
-            Returns
-            -------
-            int
-                Parent index between indices i and j.
-
-            """
+        self._sift_down_with(idx, self.items[idx], self.keys[idx])
 
-            if self._compare(self.items[i], self.items[j]):
-                self._swap(i, j)
-                return i
-            return j
+    def _sift_with(self, idx: int, item: Node, key: Any) -> None:
+        """Place item into H by treating idx as a hole and moving it up or down.
 
-        p = idx
-        l = self._left(idx)
-        r = self._right(idx)
-
-        while l != None:
-            if r == None or self._compare(self.items[l], self.items[r]):
-                next_p = helper(l, p)
-            else:
-                next_p = helper(r, p)
-
-            if next_p != p:
-                p = next_p
-                l = self._left(p)
-                r = self._right(p)
-            else:
-                break
-
-    def _swap(self, i: int, j: int) -> None:
-        """Helper method to swap items at index i and j.
+        The invariant of H can only be broken in one direction at the hole, so
+        key is compared with the key of the parent of the hole once to choose
+        between moving item upwards and moving it downwards.
 
         Parameters
         ----------
-        i : int
-        j : int
+        idx : int
+        item : Node
+        key : Any
+            The label value of item.
 
         Complexity
         ----------
         Space : O(1)
-        Time : O(1)
+        Time : O(log n)
 
         """
 
-        self.items[i], self.items[j] = self.items[j], self.items[i]
-        self.indices[self.items[i].uid] = i
-        self.indices[self.items[j].uid] = j
+        keys = self.keys
+        compare = le if self.mode == "min" else ge
+        if idx > 0 and not compare(keys[(idx - 1) >> 2], key):
+            self.items[idx], keys[idx] = item, key
+            self._bubble_up(idx)
+        else:
+            self._sift_down_with(idx, item, key)
 
-    def _compare(self, x: Node, y: Node) -> bool:
-        """Convert mode of H to a comparison function.
+    def _sift_down_with(self, idx: int, item: Node, key: Any) -> None:
+        """Place item into H by treating idx as a hole and moving it downwards.
 
-        Either computes x <= y or y >= x, if Heap mode is 'min' or
-        Heap mode is 'max', respectively.
+        Each step moves the preferred of the (up to four) children of the
+        hole up into the hole, until item can be the parent of the children
+        of the hole. The children are moved with a single assignment each,
+        and item is written into H once at its final index.
 
         Parameters
         ----------
-        x : Node
-        y : Node
+        idx : int
+        item : Node
+        key : Any
+            The label value of item.
 
-        Returns
-        -------
-        bool
+        Complexity
+        ----------
+        Space : O(1)
+        Time : O(log n)
 
         """
 
-        if self.mode == "min":
-            return x[self.label] <= y[self.label]
-        return x[self.label] >= y[self.label]
+        items, keys, indices = self.items, self.keys, self.indices
+        compare = le if self.mode == "min" else ge
+        n = len(items)
+
+        child = 4 * idx + 1
+        while child < n:
+            best = keys[child]
+            if child + 3 < n:
+                # Play the four children as a tournament of two pairs.
+                x, y, z = keys[child + 1], keys[child + 2], keys[child + 3]
+                first = child
+                if not compare(best, x):
+                    child, best = first + 1, x
+                if compare(y, z):
+                    other, value = first + 2, y
+                else:
+                    other, value = first + 3, z
+                if not compare(best, value):
+                    child, best = other, value
+            else:
+                for sibling in range(child + 1, n):
+                    if not compare(best, keys[sibling]):
+                        child, best = sibling, keys[sibling]
+            if compare(key, best):
+                break
+            below = items[child]
+            items[idx], keys[idx] = below, best
+            indices[below.uid] = idx
+            idx = child
+            child = 4 * idx + 1
+
+        items[idx], keys[idx] = item, key
+        indices[item.uid] = idx
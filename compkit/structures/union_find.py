@@ -4,18 +4,11 @@ create : @tarickali 23/12/28
 update : @tarickali 24/01/01
 """
 
-from typing import Any
-from dataclasses import dataclass
+from array import array
 
 from compkit.core import ID, Node
 
 
-@dataclass
-class Data:
-    parent: ID = None
-    rank: int = 0
-
-
 class UnionFind:
     """Generic union-find data structure.
 
@@ -25,16 +18,22 @@ class UnionFind:
 
     Implementation Note
     -------------------
-    This data structure is implemented with union-by-rank and path splitting.
+    This data structure is implemented with union-by-rank and path halving.
     As such on an instance with |U|=n items and |O|=m U.find and U.union
     operations, the amortized time complexity is O(m•α(n)), i.e. each operation
     has amortize cost of O(α(n)).
 
+    Each item is given the index of its insertion, and the parent and rank of
+    the items are stored in lists indexed by it, so the forest is walked by
+    list indexing alone. The root of a partition is its own parent.
+
     """
 
     def __init__(self, items: list[Node] = None) -> None:
-        self.items: dict[ID, Node] = {}
-        self.datum: dict[ID, Data] = {}
+        self.items: list[Node] = []
+        self.indices: dict[ID, int] = {}  # f : ID -> idx in self.items
+        self.parents: list[int] = []  # parents[idx] = idx for the roots
+        self.ranks = array("B")  # rank <= log2(n), so one byte suffices
 
         if items is not None:
             self.add_many(items)
@@ -50,11 +49,14 @@ class UnionFind:
 
         """
 
-        if item.uid in self.items:
+        if item.uid in self.indices:
             return None
 
-        self.items[item.uid] = item
-        self.datum[item.uid] = Data()
+        idx = len(self.items)
+        self.items.append(item)
+        self.indices[item.uid] = idx
+        self.parents.append(idx)
+        self.ranks.append(0)
 
     def add_many(self, items: list[Node]) -> None:
         """Add and create a new partition for each item in items in U.
@@ -87,15 +89,11 @@ class UnionFind:
 
         uid = item.uid if isinstance(item, Node) else item
 
-        if uid not in self.items:
+        idx = self.indices.get(uid)
+        if idx is None:
             return None
 
-        cid = uid
-        while self.datum[cid].parent != None:
-            parent = self.datum[cid].parent
-            grandparent = self.datum[parent].parent
-            cid, self.datum[cid].parent = parent, grandparent
-        return cid
+        return self.items[self._root(idx)].uid
 
     def union(self, u: ID | Node, v: ID | Node) -> None:
         """Merge the partitions of u and v into one partition in U.
@@ -110,21 +108,25 @@ class UnionFind:
         uid = u.uid if isinstance(u, Node) else u
         vid = v.uid if isinstance(v, Node) else v
 
-        uset = self.find(uid)
-        vset = self.find(vid)
+        uidx = self.indices.get(uid)
+        vidx = self.indices.get(vid)
 
-        if uset == None or vset == None:
+        if uidx is None or vidx is None:
             return None
 
+        uset = self._root(uidx)
+        vset = self._root(vidx)
+
         if uset == vset:
             return None
 
-        if self.datum[uset].rank < self.datum[vset].rank:
+        ranks = self.ranks
+        if ranks[uset] < ranks[vset]:
             uset, vset = vset, uset
 
-        self.datum[vset].parent = uset
-        if self.datum[uset].rank == self.datum[vset].rank:
-            self.datum[uset].rank += 1
+        self.parents[vset] = uset
+        if ranks[uset] == ranks[vset]:
+            ranks[uset] += 1
 
     def get_item(self, uid: ID) -> Node | None:
         """Get item in G with ID uid.
@@ -139,7 +141,10 @@ class UnionFind:
 
         """
 
-        return self.items.get(uid)
+        idx = self.indices.get(uid)
+        if idx is None:
+            return None
+        return self.items[idx]
 
     @property
     def size(self) -> int:
@@ -177,4 +182,30 @@ class UnionFind:
 
         """
 
-        return self.get_node(uid)
+        return self.get_item(uid)
+
+    def _root(self, idx: int) -> int:
+        """Find the index of the root of the partition of the item at idx in U.
+
+        Every other item on the way is pointed to its grandparent, and the walk
+        continues from that grandparent (path halving).
+
+        Parameters
+        ----------
+        idx : int
+
+        Returns
+        -------
+        int
+
+        """
+
+        parents = self.parents
+        parent = parents[idx]
+        while parent != idx:
+            grandparent = parents[parent]
+            if grandparent == parent:
+                return parent
+            parents[idx] = idx = grandparent
+            parent = parents[idx]
+        return idx
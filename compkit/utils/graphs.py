@@ -4,9 +4,11 @@ create : @tarickali 23/12/30
 update : @tarickali 23/12/31
 """
 
+import math
 import random
-import itertools
+from itertools import chain, count, repeat
 
+from compkit.core import Link
 from compkit.structures import Graph, DiGraph
 
 from .types import create_nodes, create_links
@@ -138,13 +140,11 @@ def complete_graph(n: int) -> Graph:
 
     nodes = create_nodes(range(n))
 
-    edges = []
-    e = 0
-    for x in range(n):
-        for y in range(x + 1, n):
-            edges.append((e, x, y))
-            e += 1
-    edges = create_links(edges)
+    # The edges (e, x, y) for x < y, as columns built by C-level iterators
+    # rather than a nested Python loop over an intermediate list of tuples.
+    xids = chain.from_iterable(map(repeat, range(n), range(n - 1, -1, -1)))
+    yids = chain.from_iterable(map(range, range(1, n + 1), repeat(n)))
+    edges = list(map(Link, count(), xids, yids))
 
     return Graph(nodes, edges)
 
@@ -179,6 +179,12 @@ def random_graph(n: int, size: int, directed: bool = False) -> Graph | DiGraph:
     This function will always return a simple graph, one with not loop and
     parallel edges.
 
+    Implementation Note
+    -------------------
+    The edges are sampled as distinct ranks in [0, M), where M is the number
+    of possible edges, and each rank is then mapped to its pair of nodes. As
+    such only O(size) memory is used rather than O(n^2) for the population.
+
     """
 
     if n <= 0:
@@ -195,11 +201,17 @@ def random_graph(n: int, size: int, directed: bool = False) -> Graph | DiGraph:
     nodes = create_nodes(range(n))
 
     if not directed:
-        population = list(itertools.combinations(range(n), 2))
+        # Rank t is the pair (x, y) with x < y and t = y * (y - 1) / 2 + x.
+        edges = []
+        for t in random.sample(range(n * (n - 1) // 2), size):
+            y = (1 + math.isqrt(8 * t + 1)) // 2
+            edges.append((t - y * (y - 1) // 2, y))
     else:
-        population = list(itertools.permutations(range(n), 2))
-
-    edges = random.sample(population, size)
+        # Rank t is the pair (x, y) with y != x and t = x * (n - 1) + y - (y > x).
+        edges = []
+        for t in random.sample(range(n * (n - 1)), size):
+            x, y = divmod(t, n - 1)
+            edges.append((x, y + (y >= x)))
     edges = create_links([(e, x, y) for e, (x, y) in enumerate(edges)])
 
     if not directed:
@@ -237,7 +249,10 @@ def complete_bipartite_graph(n: int, m: int) -> Graph:
     A = create_nodes(range(n))
     B = create_nodes(range(n, n + m))
 
-    edges = create_links([(i * m + j, i, j + n) for i in range(n) for j in range(m)])
+    # The edge (i * m + j, i, n + j), with the columns built as in complete_graph.
+    xids = chain.from_iterable(map(repeat, range(n), repeat(m)))
+    yids = chain.from_iterable(repeat(range(n, n + m), n))
+    edges = list(map(Link, count(), xids, yids))
 
     return Graph(A + B, edges)
 
@@ -265,6 +280,12 @@ def random_bipartite_graph(n: int, m: int, size: int) -> Graph:
     ValueError
         If size > n*m
 
+    Implementation Note
+    -------------------
+    The edges are sampled as distinct ranks in [0, n•m), and rank t is mapped
+    to the edge (t // m, n + t % m). As such only O(size) memory is used
+    rather than O(n•m) for the population.
+
     """
 
     if n <= 0 or m <= 0:
@@ -279,9 +300,10 @@ def random_bipartite_graph(n: int, m: int, size: int) -> Graph:
     A = create_nodes(range(n))
     B = create_nodes(range(n, n + m))
 
-    population = list(itertools.product(range(n), range(n, n + m)))
-
-    edges = random.sample(population, size)
+    edges = []
+    for t in random.sample(range(n * m), size):
+        x, y = divmod(t, m)
+        edges.append((x, n + y))
     edges = create_links([(e, x, y) for e, (x, y) in enumerate(edges)])
 
     return Graph(A + B, edges)
@@ -5,6 +5,7 @@ update : @tarickali 24/01/01
 """
 
 from typing import Any, Iterable
+from itertools import starmap
 
 from compkit.core import ID, Node, Link
 
@@ -26,18 +27,13 @@ def create_nodes(items: Iterable[ID] | dict[ID, dict[str, Any]]) -> list[Node]:
 
     """
 
-    nodes = []
     if isinstance(items, dict):
-        for uid, data in items.items():
-            nodes.append(Node(uid, data))
-    else:
-        for uid in items:
-            nodes.append(Node(uid))
-    return nodes
+        return list(map(Node, items.keys(), items.values()))
+    return list(map(Node, items))
 
 
 def create_links(
-    items: Iterable[tuple[ID, ID, ID]] | dict[ID, tuple[ID, ID, dict[str, Any]]]
+    items: Iterable[tuple[ID, ID, ID]] | dict[ID, tuple[ID, ID, dict[str, Any]]],
 ) -> list[Link]:
     """Create Link objects given a dictionary of (uid, (xid, yid, data)) pairs.
 
@@ -53,11 +49,6 @@ def create_links(
 
     """
 
-    links = []
     if isinstance(items, dict):
-        for uid, (xid, yid, data) in items.items():
-            links.append(Link(uid, xid, yid, data))
-    else:
-        for uid, xid, yid in items:
-            links.append(Link(uid, xid, yid))
-    return links
+        return [Link(uid, xid, yid, data) for uid, (xid, yid, data) in items.items()]
+    return list(starmap(Link, items))
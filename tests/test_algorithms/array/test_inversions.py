@@ -0,0 +1,29 @@
+"""
+title : test_inversions.py
+create : @tarickali 26/10/15
+update : @tarickali 26/10/15
+"""
+
+import random
+
+from compkit.algorithms.array.inversions import *
+
+
+def generate_data() -> list[int]:
+    size = random.randint(0, 100)
+    A = random.choices(range(21), k=size)
+    return A
+
+
+def brute_force(A: list[int]) -> int:
+    n = len(A)
+    return sum(1 for i in range(n) for j in range(i + 1, n) if A[j] < A[i])
+
+
+def test_inversions():
+    for _ in range(100):
+        A = generate_data()
+        count = brute_force(A)
+        assert inversions(A, inplace=False) == count
+        assert inversions(A) == count
+        assert A == sorted(A)
@@ -0,0 +1,22 @@
+"""
+title : test_search.py
+create : @tarickali 26/10/15
+update : @tarickali 26/10/15
+"""
+
+import random
+from bisect import bisect_left
+
+from compkit.algorithms.array.search import binary_search, binary_search_many
+
+
+def test_binary_search():
+    for _ in range(100):
+        A = sorted(random.choices(range(20), k=random.randint(0, 50)))
+        targets = list(range(-1, 22))
+        expected = [(target in A, bisect_left(A, target)) for target in targets]
+        assert [binary_search(A, target) for target in targets] == expected
+        assert [
+            binary_search(A, target, recursive=True) for target in targets
+        ] == expected
+        assert binary_search_many(A, targets) == expected
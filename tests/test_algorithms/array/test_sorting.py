@@ -4,8 +4,10 @@ create : @tarickali 23/12/26
 update : @tarickali 24/01/06
 """
 
+import array
 import random
 
+from compkit.algorithms.array import sorting
 from compkit.algorithms.array.sorting import *
 
 
@@ -13,7 +15,7 @@ def generate_data() -> list[int]:
     low = random.randint(0, 100)
     high = random.randint(low + 1, 500)
     size = random.randint(0, 1000)
-    A = [random.randint(low, high) for _ in range(size)]
+    A = random.choices(range(low, high + 1), k=size)
     return A
 
 
@@ -50,3 +52,62 @@ def test_quick_sort():
         A = generate_data()
         A = quick_sort(A)
         assert A == sorted(A)
+
+
+def test_fast():
+    sorts = [bubble_sort, insertion_sort, selection_sort, merge_sort, quick_sort]
+    for _ in range(100):
+        A = generate_data()
+        for sort in sorts:
+            assert sort(A, inplace=False, fast=True) == sorted(A)
+        T = array.array("q", A)
+        for sort in sorts:
+            assert sort(T, inplace=False, fast=True).tolist() == sorted(A)
+
+
+def test_typed_arrays():
+    for _ in range(100):
+        A = array.array("q", generate_data())
+        assert merge_sort(A, inplace=False).tolist() == sorted(A)
+        assert quick_sort(A, inplace=False).tolist() == sorted(A)
+
+
+def test_merge_sort_parallel(monkeypatch):
+    monkeypatch.setattr(sorting, "_PARALLEL", 0)
+    monkeypatch.setattr(sorting.os, "cpu_count", lambda: 3)
+    for _ in range(5):
+        A = generate_data()
+        assert merge_sort(A, inplace=False, parallel=True) == sorted(A)
+        assert merge_sort(A, inplace=False, fast=True, parallel=True) == sorted(A)
+
+
+def test_quick_sort_depth_limit():
+    for _ in range(20):
+        A = generate_data()
+        B = A[:]
+        sorting._quick_sort(B, 0, len(B), 0)
+        assert B == sorted(A)
+        T = array.array("q", A)
+        sorting._quick_sort(T, 0, len(T), 1)
+        assert T.tolist() == sorted(A)
+
+
+def test_comparison_sorts():
+    # Wide ranges and floats are not counted, so the comparison sorts run
+    for _ in range(20):
+        A = [random.randint(-(10**9), 10**9) for _ in range(random.randint(0, 1000))]
+        F = [random.random() for _ in range(random.randint(0, 1000))]
+        for X in (A, F, [float(x) for x in generate_data()]):
+            assert merge_sort(X, inplace=False) == sorted(X)
+            assert quick_sort(X, inplace=False) == sorted(X)
+        T = array.array("q", A)
+        assert merge_sort(T, inplace=False).tolist() == sorted(A)
+        assert quick_sort(T, inplace=False).tolist() == sorted(A)
+
+
+def test_non_numeric_sorts():
+    S = list("hello world" * 3)
+    P = [(random.randint(0, 5), random.randint(0, 5)) for _ in range(40)]
+    for X in (S, P):
+        assert quick_sort(X, inplace=False) == sorted(X)
+        assert merge_sort(X, inplace=False) == sorted(X)
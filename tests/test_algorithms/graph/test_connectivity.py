@@ -0,0 +1,48 @@
+"""
+title : test_connectivity.py
+create : @tarickali 26/10/15
+update : @tarickali 26/10/15
+"""
+
+from compkit.structures import DiGraph
+from compkit.algorithms.graph.connectivity import *
+from compkit.utils.types import create_links
+from compkit.utils.graphs import path_graph, cycle_graph
+
+
+def test_strongly_connected_components():
+    D = DiGraph(
+        edges=create_links(
+            [(0, 0, 1), (1, 1, 2), (2, 2, 0), (3, 2, 3), (4, 3, 4), (5, 4, 3)]
+        )
+    )
+    components = strongly_connected_components(D, ignore=set())
+    assert sorted(map(sorted, components)) == [[0, 1, 2], [3, 4]]
+
+    assert (
+        len(
+            strongly_connected_components(
+                cycle_graph(5000, directed=True), ignore=set()
+            )
+        )
+        == 1
+    )
+    assert (
+        len(
+            strongly_connected_components(path_graph(5000, directed=True), ignore=set())
+        )
+        == 5000
+    )
+
+
+def test_default_ignore():
+    G = path_graph(10)
+    assert connected(G)
+    assert connectivity(G) == 1
+    assert connectivity(G, ignore={5}) == 2
+    assert len(connected_components(G)) == 1
+
+    D = cycle_graph(10, directed=True)
+    assert strongly_connected(D)
+    assert strong_connectivity(D, ignore={D.get_nodes(as_nodes=True)[0]}) == 9
+    assert len(strongly_connected_components(D)) == 1
@@ -0,0 +1,27 @@
+"""
+title : test_dag.py
+create : @tarickali 26/10/15
+update : @tarickali 26/10/15
+"""
+
+from compkit.structures import DiGraph
+from compkit.algorithms.graph.dag import *
+from compkit.utils.types import create_links
+from compkit.utils.graphs import path_graph, cycle_graph
+
+
+def test_is_cyclic():
+    assert not is_cyclic(path_graph(5000, directed=True))
+    assert is_cyclic(cycle_graph(5000, directed=True))
+    assert is_acyclic(path_graph(10, directed=True, reverse=True))
+
+
+def test_topological_sort():
+    D = DiGraph(edges=create_links([(0, 0, 1), (1, 0, 2), (2, 1, 3), (3, 2, 3)]))
+    ordering = topological_sort(D)
+    position = {x: i for i, x in enumerate(ordering)}
+    for e in D.get_edges(as_links=True):
+        assert position[e.xid] < position[e.yid]
+
+    assert topological_sort(path_graph(5000, directed=True)) == list(range(5000))
+    assert topological_sort(cycle_graph(10, directed=True)) is None
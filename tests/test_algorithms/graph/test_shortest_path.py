@@ -0,0 +1,147 @@
+"""
+title : test_shortest_path.py
+create : @tarickali 26/10/15
+update : @tarickali 26/10/15
+"""
+
+import random
+
+from compkit.core import INF
+from compkit.structures import Graph, DiGraph
+from compkit.algorithms.graph.shortest_path import *
+from compkit.algorithms.graph import shortest_path
+from compkit.algorithms.graph.shortest_path import bellman_ford, floyd_warshall, johnson
+from compkit.utils.types import create_nodes, create_links
+
+
+def generate_data() -> Graph:
+    n = random.randint(1, 30)
+    m = random.randint(0, 100)
+    edges = {
+        e: (random.randrange(n), random.randrange(n), {"w": random.randint(0, 20)})
+        for e in range(m)
+    }
+    return Graph(create_nodes(range(n)), create_links(edges))
+
+
+def generate_digraph(low: int = 0) -> DiGraph:
+    n = random.randint(1, 20)
+    m = random.randint(0, 60)
+    edges = {}
+    for e in range(m):
+        x, y = random.sample(range(n), 2) if n > 1 else (0, 0)
+        if x != y:
+            edges[e] = (x, y, {"w": random.randint(low, 20)})
+    return DiGraph(create_nodes(range(n)), create_links(edges))
+
+
+def brute_force(G: Graph, s: int) -> dict[int, float]:
+    dist = {x: INF for x in G.get_nodes()}
+    dist[s] = 0
+    for _ in range(G.order):
+        for e in G.get_edges(as_links=True):
+            for x, y in [e.nodes(), e.nodes(reverse=True)]:
+                dist[y] = min(dist[y], dist[x] + e["w"])
+    return dist
+
+
+def test_dijkstra():
+    for _ in range(50):
+        G = generate_data()
+        s = G.choose_node()
+        dist, prev = dijkstra(G, s, "w", include_prev=True)
+        assert dist == brute_force(G, s)
+        for x, y in prev.items():
+            if y is not None:
+                assert dist[x] == dist[y] + min(
+                    e["w"] for e in G.get_edges_between(y, x, as_links=True)
+                )
+
+
+def brute_force_directed(D: DiGraph, s: int) -> dict[int, float] | None:
+    dist = {x: INF for x in D.get_nodes()}
+    dist[s] = 0
+    for _ in range(D.order):
+        for e in D.get_edges(as_links=True):
+            dist[e.yid] = min(dist[e.yid], dist[e.xid] + e["w"])
+    for e in D.get_edges(as_links=True):
+        if dist[e.xid] + e["w"] < dist[e.yid]:
+            return None
+    return dist
+
+
+def test_bellman_ford():
+    for low in [0, -3]:
+        for _ in range(50):
+            D = generate_digraph(low)
+            s = D.choose_node()
+            expected = brute_force_directed(D, s)
+            result = bellman_ford(D, s, "w", include_prev=True)
+            if expected is None:
+                assert result is None
+                continue
+            dist, prev = result
+            assert dist == expected
+            for x, y in prev.items():
+                if y is not None:
+                    assert dist[x] == dist[y] + min(
+                        e["w"] for e in D.get_edges_between(y, x, as_links=True)
+                    )
+
+
+def test_floyd_warshall():
+    for low in [0, -3]:
+        for _ in range(50):
+            D = generate_digraph(low)
+            expected = {x: brute_force_directed(D, x) for x in D.get_nodes()}
+            result = floyd_warshall(D, "w", include_succ=True)
+            if any(dist is None for dist in expected.values()):
+                assert result is None
+                continue
+            dist, succ = result
+            assert dist == expected
+            assert floyd_warshall(D, "w") == expected
+            for x in dist:
+                for y in dist[x]:
+                    if x != y and dist[x][y] != INF:
+                        z = succ[x][y]
+                        assert dist[x][y] == dist[z][y] + min(
+                            e["w"] for e in D.get_edges_between(x, z, as_links=True)
+                        )
+
+
+def test_delta_stepping():
+    for delta in [None, 1, 5, 100]:
+        for _ in range(50):
+            G = generate_data()
+            s = G.choose_node()
+            dist, prev = delta_stepping(G, s, "w", delta=delta, include_prev=True)
+            assert dist == brute_force(G, s)
+            for x, y in prev.items():
+                if y is not None:
+                    assert dist[x] == dist[y] + min(
+                        e["w"] for e in G.get_edges_between(y, x, as_links=True)
+                    )
+
+
+def test_johnson(monkeypatch):
+    for low in [0, -3]:
+        for _ in range(50):
+            D = generate_digraph(low)
+            expected = floyd_warshall(D, "w")
+            result = johnson(D, "w", include_prev=True)
+            if expected is None:
+                assert result is None
+                continue
+            dist, prev = result
+            assert dist == expected
+            for x in dist:
+                for y, z in prev[x].items():
+                    if z is not None:
+                        assert dist[x][y] == dist[x][z] + min(
+                            e["w"] for e in D.get_edges_between(z, y, as_links=True)
+                        )
+
+    monkeypatch.setattr(shortest_path.os, "cpu_count", lambda: 2)
+    D = generate_digraph()
+    assert johnson(D, "w", parallel=True) == floyd_warshall(D, "w")
@@ -0,0 +1,263 @@
+"""
+title : test_graph.py
+create : @tarickali 26/10/15
+update : @tarickali 26/10/15
+"""
+
+import random
+import pytest
+
+from compkit.core import Node, Link
+from compkit.structures import Graph, DiGraph
+from compkit.utils.types import create_nodes
+
+
+def test_csr():
+    nodes = create_nodes(range(4))
+    edges = [Link(0, 0, 1), Link(1, 0, 1), Link(2, 1, 2), Link(3, 3, 3)]
+
+    G = Graph(nodes, edges)
+    order, indptr, indices, eids = G.csr()
+    assert order == [0, 1, 2, 3]
+    assert list(indptr) == [0, 2, 5, 6, 7]
+    assert sorted(indices[indptr[1] : indptr[2]]) == [0, 0, 2]
+    assert sorted(eids[indptr[1] : indptr[2]]) == [0, 1, 2]
+    assert G.csr() is G.csr()
+
+    G.remove_edge(2)
+    assert list(G.csr()[1]) == [0, 2, 4, 4, 5]
+
+    D = DiGraph(nodes, edges)
+    assert list(D.csr()[1]) == [0, 2, 3, 3, 4]
+    assert list(D.cocsr()[1]) == [0, 0, 2, 3, 4]
+    assert list(D.transpose().csr()[1]) == [0, 0, 2, 3, 4]
+
+
+def test_has_parallel_edges():
+    nodes = create_nodes(range(3))
+
+    G = Graph(nodes, [Link(0, 0, 1), Link(1, 1, 2)])
+    assert not G.has_parallel_edges()
+    G.add_edge(Link(2, 1, 0))
+    assert G.has_parallel_edges()
+
+    D = DiGraph(nodes, [Link(0, 0, 1), Link(1, 1, 0)])
+    assert not D.has_parallel_edges()
+    D.add_edge(Link(2, 0, 1))
+    assert D.has_parallel_edges()
+
+
+def test_copy():
+    for graph in [Graph, DiGraph]:
+        nodes = create_nodes(range(3))
+        edges = [Link(0, 0, 1, {"weight": [1]}), Link(1, 1, 2), Link(2, 1, 2)]
+        G = graph(nodes, edges)
+        C = G.copy()
+        assert type(C) is type(G)
+        assert C.get_nodes() == G.get_nodes()
+        assert C.get_edges() == G.get_edges()
+        assert all(C.adjacent(x) == G.adjacent(x) for x in G.get_nodes())
+        assert C.get_edges_between(1, 2) == G.get_edges_between(1, 2)
+
+        C.remove_node(2)
+        C.get_edge(0)["weight"].append(2)
+        assert G.order == 3 and G.size == 3
+        assert G.get_edge(0)["weight"] == [1]
+
+        S = G.copy(deep=False)
+        S.get_edge(0)["weight"].append(2)
+        assert G.get_edge(0)["weight"] == [1, 2]
+
+
+def test_sampling():
+    G = Graph(create_nodes(range(5)), [Link(i, i, (i + 1) % 5) for i in range(5)])
+
+    assert G.choose_node() in G.get_nodes()
+    assert G.choose_edge(as_links=True) in G.get_edges(as_links=True)
+    assert len(set(G.sample_nodes(5))) == 5
+    assert set(G.sample_edges(5)) == set(G.get_edges())
+    assert all(x.uid in G for x in G.sample_nodes(3, as_nodes=True))
+
+    G.remove_node(0)
+    assert set(G.sample_nodes(4)) == {1, 2, 3, 4}
+    assert set(G.sample_edges(3)) == {1, 2, 3}
+    G.add_edge(Link(5, 4, 1))
+    assert set(G.sample_edges(4)) == {1, 2, 3, 5}
+
+
+def test_index():
+    G = Graph(create_nodes(["a", "b", "c"]), [Link(0, "a", "b")])
+
+    index = G.index()
+    assert index == {"a": 0, "b": 1, "c": 2}
+    assert list(index) == G.csr()[0]
+    G.add_edge(Link(1, "b", "c"))
+    assert G.index() is index
+    G.remove_node("a")
+    assert G.index() == {"b": 0, "c": 1}
+
+
+def test_add_edges():
+    for graph in [Graph, DiGraph]:
+        G = graph(create_nodes([0]))
+        G.add_edges([Link(0, 0, 1), Link(1, 1, 2), Link(0, 2, 3), Link(2, 2, 2)])
+
+        assert G.get_nodes() == [0, 1, 2]
+        assert G.get_edges() == [0, 1, 2]
+        assert G.get_edge(0).yid == 1
+        assert G.adjacent(1) == [2] if G.is_directed else [0, 2]
+        assert G.has_loops()
+
+
+def test_remove_nodes():
+    for graph in [Graph, DiGraph]:
+        edges = [Link(0, 0, 0), Link(1, 0, 1), Link(2, 1, 2), Link(3, 2, 3)]
+        G = graph(create_nodes(range(4)), edges + [Link(4, 3, 1)])
+
+        G.remove_node(0)
+        assert G.get_nodes() == [1, 2, 3]
+        assert G.get_edges() == [2, 3, 4]
+
+        G.remove_nodes([1, 2, 5])
+        assert G.get_nodes() == [3]
+        assert G.get_edges() == []
+        assert G.adjacent(3) == []
+        assert G.degree(3) == 0
+
+
+def test_conversion():
+    nodes = create_nodes(range(4))
+    edges = [Link(0, 0, 1), Link(1, 1, 2), Link(2, 2, 1)]
+
+    D = Graph(nodes, edges).to_directed()
+    assert D.is_directed
+    assert D.get_nodes() == [0, 1, 2, 3]
+    assert D.size == 6
+    assert D.get_edge(0).xid == 0 and D.get_edge(0).yid == 1
+    assert D.get_edge(1).xid == 1 and D.get_edge(1).yid == 0
+    assert sorted(D.get_edges()) == [0, 1, 2, 3, 4, 5]
+    assert Graph(edges=[Link("e", 0, 1)]).to_directed().get_edges() == [
+        ("e", "f"),
+        ("e", "r"),
+    ]
+    assert sorted(D.adjacent(1)) == [0, 2]
+
+    G = DiGraph(nodes, edges).to_undirected()
+    assert G.is_undirected
+    assert G.get_nodes() == [0, 1, 2, 3]
+    assert G.get_edges() == [0, 1, 2]
+    assert G.adjacent(1) == [0, 2]
+    assert sorted(G.get_edges_between(1, 2)) == [1, 2]
+
+
+def test_counters():
+    for graph in [Graph, DiGraph]:
+        G = graph(create_nodes(range(10)))
+        for i in range(200):
+            if random.random() < 0.7:
+                G.add_edge(Link(i, random.randrange(10), random.randrange(10)))
+            elif random.random() < 0.8 and G.size > 0:
+                G.remove_edge(G.choose_edge())
+            else:
+                G.remove_node(random.randrange(10))
+                G.add_node(Node(random.randrange(10)))
+
+            pairs = [
+                (e.xid, e.yid) if G.is_directed else frozenset((e.xid, e.yid))
+                for e in G.get_edges(as_links=True)
+            ]
+            assert G.has_loops() == any(e.xid == e.yid for e in G.get_edges(True))
+            assert G.has_parallel_edges() == (len(set(pairs)) < len(pairs))
+            assert G.copy().has_parallel_edges() == G.has_parallel_edges()
+            assert all(G.degree(x) == len(G.incident(x)) for x in G.get_nodes())
+            if G.is_directed:
+                T = G.transpose(inplace=False)
+                assert all(
+                    G.codegree(x) == len(G.coincident(x)) == T.degree(x)
+                    for x in G.get_nodes()
+                )
+
+        G.remove_loops()
+        assert not G.has_loops() and G.get_loops() == []
+
+
+def test_adjacency_cells():
+    for graph in [Graph, DiGraph]:
+        G = graph(create_nodes(range(3)), [Link(0, 0, 1), Link(1, 0, 1), Link(2, 1, 1)])
+
+        assert sorted(G.get_edges_between(0, 1)) == [0, 1]
+        assert sorted(G.incident(0)) == [0, 1]
+        G.remove_edge(0)
+        assert G.get_edges_between(0, 1) == [1]
+        assert G.neighbors(0, 1)
+        G.remove_edge(1)
+        assert G.get_edges_between(0, 1) == []
+        assert not G.neighbors(0, 1)
+        assert G.adjacent(0) == []
+        assert G.incident(1) == [2]
+        G.remove_edge(2)
+        assert G.adjacent(1) == []
+
+
+def test_contract_edge():
+    for graph in [Graph, DiGraph]:
+        edges = [Link(0, 0, 1), Link(1, 0, 1), Link(2, 1, 2), Link(3, 3, 1)]
+        G = graph(create_nodes(range(4)), edges + [Link(4, 1, 1)])
+
+        G.contract_edge(0)
+        assert G.get_nodes() == [0, 2, 3]
+        assert sorted(G.get_edges()) == [1, 2, 3, 4]
+        assert sorted(G.get_loops()) == [1, 4]
+        assert (G.get_edge(2).xid, G.get_edge(2).yid) == (0, 2)
+        assert (G.get_edge(3).xid, G.get_edge(3).yid) == (3, 0)
+        assert G.get_node(0)["multinode"] == {0, 1}
+        assert G.neighbors(0, 2) and G.get_edges_between(0, 0) != []
+
+
+def test_as_csr():
+    for graph in [Graph, DiGraph]:
+        edges = [
+            Link(i, *xy, {"w": i}) for i, xy in enumerate(["ab", "ab", "bc", "cc"])
+        ]
+        G = graph(create_nodes("abcd"), edges)
+
+        indptr, indices, weights, nodes = G.as_csr("w")
+        assert nodes == ["a", "b", "c", "d"]
+        assert len(indices) == len(weights) == (4 if G.is_directed else 7)
+        assert G.as_csr()[2] is None
+        indices[0] = 3
+        assert G.csr()[2][0] != 3
+
+        H = graph.from_csr(*G.as_csr("w"), label="w")
+        assert H.get_nodes() == G.get_nodes()
+        assert H.size == G.size
+        assert all(H.degree(x) == G.degree(x) for x in nodes)
+        assert sorted(e["w"] for e in H.get_edges(True)) == [0, 1, 2, 3]
+        assert H.get_loops(as_links=True)[0]["w"] == 3
+
+
+def test_reorder():
+    ids = list(range(10))
+    random.shuffle(ids)
+    for graph in [Graph, DiGraph]:
+        G = graph(create_nodes(ids), [Link(i, i, i + 1) for i in range(9)])
+        G.add_edges([Link(9, 4, 10), Link(10, 4, 11)])
+
+        G.reorder("rcm")
+        index = G.index()
+        assert G.get_nodes() == G.csr()[0]
+        assert max(abs(index[e.xid] - index[e.yid]) for e in G.get_edges(True)) <= 3
+
+        G.reorder("degree")
+        assert G.get_nodes()[0] == 4
+
+        G.reorder("bfs")
+        assert sorted(G.get_nodes()) == list(range(12))
+
+        G.reorder(list(range(12)))
+        assert G.index() == {x: x for x in range(12)}
+
+        with pytest.raises(ValueError):
+            G.reorder([0, 1])
+        with pytest.raises(ValueError):
+            G.reorder("random")
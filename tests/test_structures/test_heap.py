@@ -12,7 +12,7 @@ from compkit.utils.types import create_nodes
 
 
 def generate_data() -> list[Node]:
-    values = [random.randint(0, 10000) for _ in range(1000)]
+    values = random.choices(range(10001), k=1000)
     return create_nodes({i: {"val": i} for i in values})
 
 
@@ -22,9 +22,7 @@ def test_heap():
         print(generate_data())
         heap = Heap.heapify(generate_data(), label="val", mode="min")
 
-        sorted_items = []
-        while not heap.empty():
-            sorted_items.append(heap.extract()["val"])
+        sorted_items = [item["val"] for item in heap.drain()]
 
         assert sorted_items == sorted(sorted_items)
 
@@ -32,9 +30,7 @@ def test_heap():
     for _ in range(10):
         heap = Heap.heapify(generate_data(), label="val", mode="max")
 
-        sorted_items = []
-        while not heap.empty():
-            sorted_items.append(heap.extract()["val"])
+        sorted_items = [item["val"] for item in heap.drain()]
 
         assert sorted_items == sorted(sorted_items, reverse=True)
 
@@ -44,8 +40,87 @@ def test_heap():
         for item in generate_data():
             heap.insert(item)
 
-        sorted_items = []
-        while not heap.empty():
-            sorted_items.append(heap.extract()["val"])
+        sorted_items = [item["val"] for item in heap.drain()]
 
         assert sorted_items == sorted(sorted_items)
+
+
+def test_modify():
+    for _ in range(10):
+        items = generate_data()
+        heap = Heap.heapify(items, label="val", mode="min")
+
+        values = {item.uid: item["val"] for item in items}
+        for uid in random.sample(list(values), len(values) // 2):
+            values[uid] = random.randint(-10000, 10000)
+            heap.modify(uid, {"val": values[uid]})
+
+        sorted_items = []
+        for item in heap.drain():
+            assert item["val"] == values[item.uid]
+            sorted_items.append(item["val"])
+
+        assert sorted_items == sorted(values.values())
+
+
+def test_replaceroot():
+    for mode in ["min", "max"]:
+        items = generate_data()
+        heap = Heap.heapify(items, label="val", mode=mode)
+        values = [item["val"] for item in items]
+
+        for i in range(len(items) // 2):
+            value = random.randint(0, 10000)
+            root = heap.replaceroot(Node(("new", i), {"val": value}))
+            best = min(values) if mode == "min" else max(values)
+            assert root["val"] == best
+            values.remove(best)
+            values.append(value)
+
+        sorted_items = [item["val"] for item in heap.drain()]
+
+        assert sorted_items == sorted(values, reverse=mode == "max")
+        assert heap.indices == {}
+
+
+def test_heapify_invariant():
+    for n in [0, 1, 2, 3, 100, 70000]:
+        items = create_nodes({i: {"val": random.random()} for i in range(n)})
+        for mode in ["min", "max"]:
+            heap = Heap.heapify(items, label="val", mode=mode)
+            for i in range(1, n):
+                parent, child = heap.items[(i - 1) // 4]["val"], heap.items[i]["val"]
+                assert parent <= child if mode == "min" else parent >= child
+            assert all(heap.indices[item.uid] == i for i, item in enumerate(heap.items))
+            assert heap.keys == [item["val"] for item in heap.items]
+
+
+def test_delete_last():
+    items = create_nodes({i: {"val": i} for i in range(10)})
+    heap = Heap.heapify(items, label="val", mode="min")
+    last = heap.items[-1]
+    heap.delete(last)
+    assert last not in heap
+    assert heap.size() == 9
+    assert [heap.extract()["val"] for _ in range(9)] == sorted(
+        item["val"] for item in items if item is not last
+    )
+
+
+def test_merge():
+    for mode in ["min", "max"]:
+        heaps = [
+            Heap.heapify(generate_data(), label="val", mode=mode),
+            Heap.heapify(generate_data()[:10], label="val", mode=mode),
+            Heap.heapify(generate_data(), label="val", mode="min"),
+        ]
+        merged = Heap.merge(heaps, label="val", mode=mode)
+        assert set(merged.indices) == {
+            (item.uid, i) for i, heap in enumerate(heaps) for item in heap.items
+        }
+
+        sorted_items = [item["val"] for item in merged.drain()]
+        assert merged.empty()
+
+        values = [item["val"] for heap in heaps for item in heap.items]
+        assert sorted_items == sorted(values, reverse=mode == "max")
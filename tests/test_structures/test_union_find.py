@@ -23,3 +23,6 @@ def test_union_find():
     assert U.find(0) == U.find(2)
 
     assert len(U) == 3
+    assert U[1] is nodes[1]
+    assert U.get_item(3) is None
+    assert U.find(3) is None
@@ -0,0 +1,78 @@
+"""
+title : test_graphs.py
+create : @tarickali 26/10/15
+update : @tarickali 26/10/15
+"""
+
+from compkit.structures import DiGraph
+from compkit.utils.graphs import (
+    random_graph,
+    complete_bipartite_graph,
+    random_bipartite_graph,
+)
+
+
+def endpoints(G) -> list[tuple]:
+    return [(e.xid, e.yid) for e in G.get_edges(as_links=True)]
+
+
+def test_random_graph():
+    for n in range(1, 8):
+        maximum = n * (n - 1) // 2
+        for size in {0, maximum // 2, maximum}:
+            G = random_graph(n, size)
+            pairs = endpoints(G)
+            assert G.order == n
+            assert len(pairs) == size
+            assert all(0 <= x < n and 0 <= y < n and x != y for x, y in pairs)
+            assert len({frozenset(pair) for pair in pairs}) == size
+            if size == maximum:
+                assert {frozenset(pair) for pair in pairs} == {
+                    frozenset((x, y)) for x in range(n) for y in range(x + 1, n)
+                }
+
+
+def test_random_digraph():
+    for n in range(1, 8):
+        maximum = n * (n - 1)
+        for size in {0, maximum // 2, maximum}:
+            D = random_graph(n, size, directed=True)
+            pairs = endpoints(D)
+            assert isinstance(D, DiGraph)
+            assert D.order == n
+            assert len(pairs) == size
+            assert all(0 <= x < n and 0 <= y < n and x != y for x, y in pairs)
+            assert len(set(pairs)) == size
+            if size == maximum:
+                assert set(pairs) == {
+                    (x, y) for x in range(n) for y in range(n) if x != y
+                }
+
+
+def test_random_bipartite_graph():
+    for n in range(1, 5):
+        for m in range(1, 5):
+            for size in {0, n * m // 2, n * m}:
+                B = random_bipartite_graph(n, m, size)
+                pairs = endpoints(B)
+                assert B.order == n + m
+                assert len(pairs) == size
+                assert all(0 <= x < n and n <= y < n + m for x, y in pairs)
+                assert len(set(pairs)) == size
+                if size == n * m:
+                    assert set(pairs) == {
+                        (x, y) for x in range(n) for y in range(n, n + m)
+                    }
+
+
+def test_complete_bipartite_graph():
+    for n in range(1, 6):
+        for m in range(1, 6):
+            B = complete_bipartite_graph(n, m)
+            edges = B.get_edges(as_links=True)
+            pairs = [(e.xid, e.yid) for e in edges]
+            assert B.order == n + m
+            assert len(pairs) == n * m
+            assert sorted(pairs) == [(x, y) for x in range(n) for y in range(n, n + m)]
+            assert sorted(e.uid for e in edges) == list(range(n * m))
+            assert all(e.uid == e.xid * m + e.yid - n for e in edges)